@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Tools built around the GEOPHIRES v2.0 simulator (GEOPHIRESv2.py).
+
+Modules:
+    benchmark   benchmark suite with reference timings (python -m geophires.benchmark)
+    batch       batch runs with design constraint screening and CSV result table (python -m geophires.batch)
+    session     incremental what-if sessions recalculating only the stages depending on changed parameters
+    vectorized  vectorized engine evaluating many scenarios at once with NumPy
+    kernels     optional Numba-compiled kernels of the vectorized engine (GEOPHIRES_BACKEND=numba)
+    chp         CHP fraction sweeps of the parallel cogeneration cycle in one vectorized call (python -m geophires.chp)
+    mapping     gridded resource mapping over rasters of gradients, layer thicknesses and surface temperature
+    equivalence numerical-equivalence harness comparing accelerated engines with GEOPHIRESv2.py (python -m geophires.equivalence)
+    server      local simulation server with warm worker processes (python -m geophires.server)
+    pareto      NSGA-II style Pareto search over Price, capacity and capital cost (python -m geophires.pareto)
+    surrogate   Gaussian process surrogate model with uncertainty and engine fallback (python -m geophires.surrogate)
+    sweep       lazily expanded parameter sweeps run with the batch engine (python -m geophires.sweep)
+"""
+
+import os
+import sys
+
+#GEOPHIRESv2.py is located in the folder containing this package
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if rootdir not in sys.path:
+    sys.path.insert(0, rootdir)
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+Batch runs of GEOPHIRES v2.0
+
+Runs a list of input files and writes one row per case to a CSV result table
+(status, screening result, key results and wall time). With constraint
+screening (default: all constraints of GEOPHIRESv2.constraints) infeasible
+designs stop directly after the stage that reveals the violation, e.g. after
+the geotherm stage (before the reservoir model) for a reservoir depth beyond
+the depth of maximum temperature, and the skip reason is recorded in the table.
+
+Long runs can be checkpointed: the rows of finished cases are appended to a
+checkpoint file (JSON lines, one write per checkpoint interval) and a rerun
+with the same checkpoint file skips the cases found in it. With a per-case
+timeout every case runs in a worker process that is killed (with TOUGH2 or any
+other process it started) when the case takes longer; the case is recorded
+with status 'timeout' and the next case starts in a new worker process.
+
+Runs too large for one machine are split into shards described by a manifest
+(JSON: the case list, the number of shards and the screened constraints). Shard
+k of N holds every N-th case starting with case k, so the split only depends on
+the manifest. Every node runs its shards on a shared file system; the results of
+shard k are recorded (and resumed) in the checkpoint file shard-k-of-N.jsonl
+next to the manifest, keyed by the case paths relative to the manifest folder
+(nodes may mount the shared file system at different paths). The merge step combines the shard results in manifest
+order into one result table and fails if a case has no result.
+
+Generated cases are often effectively identical: they differ only in
+parameters the selected models do not use, or in values replaced by the same
+default or range limit. With deduplication every case is reduced to its
+canonical input parameters (GEOPHIRESv2.canonicalinput) and hashed; a case
+with the hash of a case that already finished is not run again but gets its
+row (and case report), with duplicateof naming that case.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.batch Examples/example1.txt Examples/example2.txt --output results.csv
+    python -m geophires.batch cases/*.txt --screen maxdepth,pumpdepth --reports reports
+    python -m geophires.batch cases/*.txt --screen none
+    python -m geophires.batch cases/*.txt --timeout 600 --checkpoint run.ckpt --checkpoint-interval 60
+    python -m geophires.batch cases/*.txt --dedup
+    python -m geophires.batch cases/*.txt --manifest run/manifest.json --shards 16      (write manifest)
+    python -m geophires.batch --manifest run/manifest.json --shard 3/16                 (on every node)
+    python -m geophires.batch --manifest run/manifest.json --merge --output results.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#columns of the result table
+columns = ['case', 'status', 'skipconstraint', 'skipreason', 'laststage', 'price', 'capitalcost',
+           'averagenetelectricity', 'averageheatproduced', 'averageproducedtemperature', 'walltime', 'message',
+           'inputhash', 'duplicateof']
+
+
+def resultrow(case, simulation):
+    """returns result table row for a SimulationResult"""
+    row = {'case': case, 'status': simulation.status, 'skipconstraint': simulation.skipconstraint,
+           'skipreason': simulation.skipreason, 'laststage': list(simulation.stagetimes)[-1]}
+    if simulation.status == 'ok':
+        variables = simulation.variables
+        row['price'] = variables['Price']
+        row['capitalcost'] = variables['Ccap']
+        if variables['enduseoption'] != 2:
+            row['averagenetelectricity'] = np.average(variables['NetElectricityProduced'])
+        if variables['enduseoption'] != 1:
+            row['averageheatproduced'] = np.average(variables['HeatProduced'])
+        row['averageproducedtemperature'] = np.average(variables['ProducedTemperature'])
+    return row
+
+
+def casename(fname, content=None):
+    """returns case name of an input file (or fname itself for cases given as input file content)"""
+    return fname if content is not None else os.path.splitext(os.path.basename(fname))[0]
+
+
+def runcase(fname, constraints=None, outputfname=None, content=None):
+    """runs one input file in the current process (simulation screen output suppressed) and returns result table row
+
+    file names in the input file are relative to the GEOPHIRES folder, as with GEOPHIRESv2.py
+    content: input file content (list of lines), parameter mapping {parameter name: value} or GEOPHIRESv2.InputValues
+    run instead of an input file, fname is then the case name"""
+    import GEOPHIRESv2
+    case = casename(fname, content)
+    fname = os.path.abspath(fname)
+    tmpdir = None
+    if outputfname is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        outputfname = os.path.join(tmpdir.name, 'HDR.out')
+    outputfname = os.path.abspath(outputfname)
+    cwd = os.getcwd()
+    stdout = sys.stdout
+    tic = time.perf_counter()
+    try:
+        os.chdir(rootdir)
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            simulation = GEOPHIRESv2.runGEOPHIRES(fname, outputfname, constraints, content)
+        row = resultrow(case, simulation)
+    except SystemExit:
+        row = {'case': case, 'status': 'error', 'message': 'simulation aborted'}
+    except Exception as e:
+        row = {'case': case, 'status': 'error', 'message': '%s: %s' % (type(e).__name__, e)}
+    finally:
+        sys.stdout = stdout
+        os.chdir(cwd)
+        if tmpdir is not None:
+            tmpdir.cleanup()
+    row['walltime'] = time.perf_counter()-tic
+    return row
+
+
+def caseworker(connection):
+    """worker process running the cases received on connection (in its own process group, so a timed out case can
+    be killed together with the processes it started)"""
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+        connection.send(runcase(*job))
+
+
+class CaseWorker(object):
+    """worker process running one case at a time with a timeout; a timed out worker is killed and replaced"""
+
+    def __init__(self):
+        self.process = None
+
+    def start(self):
+        self.connection, workerconnection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=caseworker, args=(workerconnection,), daemon=True)
+        self.process.start()
+
+    def kill(self):
+        if hasattr(os, 'killpg'):
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self.process.kill()
+        self.process.join()
+        self.process = None
+
+    def run(self, fname, constraints=None, outputfname=None, timeout=None, content=None):
+        """runs one input file (or input file content, see runcase) in the worker process and returns result table
+        row (status 'timeout' if the case did not finish within timeout seconds)"""
+        if self.process is None:
+            self.start()
+        tic = time.perf_counter()
+        self.connection.send((fname, constraints, outputfname, content))
+        if self.connection.poll(timeout):
+            try:
+                return self.connection.recv()
+            except EOFError:
+                message = 'worker process terminated'
+        else:
+            message = 'timed out after %g s' % timeout
+        self.kill()
+        return {'case': casename(fname, content), 'status': 'timeout' if message.startswith('timed')
+                else 'error', 'message': message, 'walltime': time.perf_counter()-tic}
+
+    def close(self):
+        if self.process is not None:
+            self.connection.send(None)
+            self.process.join()
+            self.process = None
+
+
+def readcheckpoint(fname):
+    """returns dictionary case id -> result table row of the finished cases in a checkpoint file (a line cut off
+    by an interrupted write is ignored)"""
+    finished = {}
+    if fname is None or not os.path.exists(fname):
+        return finished
+    with open(fname, encoding='UTF-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            finished[record['id']] = record['row']
+    return finished
+
+
+def writecheckpoint(fname, records):
+    """appends (case id, row) records to the checkpoint file in one write and flushes them to disk"""
+    if fname is None or not records:
+        return
+    data = ''.join(json.dumps({'id': caseid, 'row': row}, default=float)+'\n' for caseid, row in records).encode('UTF-8')
+    with open(fname, 'a+b') as f:
+        #a line cut off by an interrupted write is terminated, so it does not swallow the first new record
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                data = b'\n'+data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def checkpointid(fname, checkpointroot=None):
+    """returns checkpoint id of an input file: its path relative to checkpointroot, None: its absolute path"""
+    if checkpointroot is None:
+        return os.path.abspath(fname)
+    return os.path.relpath(os.path.abspath(fname), checkpointroot)
+
+
+def contenthash(content):
+    """returns hash of input file content (list of lines), parameter mapping or GEOPHIRESv2.InputValues, the
+    checkpoint id of a case given as content: a case is resumed only with the same input, not by its (positional)
+    case name"""
+    data = json.dumps(content, sort_keys=True, default=lambda value: getattr(value, '__dict__', str(value)))
+    return hashlib.sha256(data.encode('UTF-8')).hexdigest()
+
+
+def caseinputhash(fname, content=None):
+    """returns GEOPHIRESv2.inputhash of the canonical input parameters of a case (input file or input file content),
+    None if the input cannot be read"""
+    import GEOPHIRESv2
+    stdout = sys.stdout
+    try:
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            if content is None:
+                content = GEOPHIRESv2.readinputfile(os.path.abspath(fname))
+            return GEOPHIRESv2.inputhash(GEOPHIRESv2.readinput(content))
+    except (SystemExit, Exception):
+        return None
+    finally:
+        sys.stdout = stdout
+
+
+def runbatch(fnames, constraints=None, reportdir=None, progress=None, timeout=None, checkpoint=None,
+             checkpointinterval=60., dedup=False, checkpointroot=None):
+    """runs all input files and returns list of result table rows (see iterbatch)"""
+    return list(iterbatch(fnames, constraints, reportdir, progress, timeout, checkpoint, checkpointinterval, dedup,
+                          checkpointroot))
+
+
+def iterbatch(fnames, constraints=None, reportdir=None, progress=None, timeout=None, checkpoint=None,
+              checkpointinterval=60., dedup=False, checkpointroot=None):
+    """runs the cases one by one and yields their result table rows
+
+    fnames: input files, or (case name, input file content) pairs (e.g. expanded lazily by geophires.sweep)
+    constraints: list of GEOPHIRESv2.Constraint for screening (None: no screening)
+    reportdir: folder for the case reports (<case>.out), None: case reports are discarded
+    progress: function called with every row after its case finished
+    timeout: maximum run time per case in seconds (None: cases run in the current process without timeout)
+    checkpoint: checkpoint file; cases found in it (by input file name or, for input file content, by contenthash)
+    are not run again,
+    rows of finished cases are appended to it every checkpointinterval seconds and at the end
+    dedup: cases with the same canonical input parameters (GEOPHIRESv2.inputhash) as a case that finished (ok or
+    skipped) are not run again; they get the row of that case (with their case name and duplicateof set to it) and
+    a copy of its case report
+    checkpointroot: folder the input file names in the checkpoint file are relative to (e.g. the manifest folder, so
+    the checkpoint file does not depend on where a node mounts the shared file system), None: absolute file names"""
+    finished = readcheckpoint(checkpoint)
+    worker = CaseWorker() if timeout is not None else None
+    #inputhash -> (row, case report) of the cases run (or found in the checkpoint file)
+    computed = {}
+    for row in finished.values():
+        if row.get('inputhash') and not row.get('duplicateof') and row['status'] in ['ok', 'skipped']:
+            computed.setdefault(row['inputhash'], (row, None))
+    pending = []
+    lastcheckpoint = time.perf_counter()
+    try:
+        for fname in fnames:
+            content = None
+            if not isinstance(fname, str):
+                fname, content = fname
+            caseid = checkpointid(fname, checkpointroot) if content is None else contenthash(content)
+            if caseid in finished:
+                yield dict(finished[caseid], case=casename(fname, content))
+                continue
+            outputfname = None
+            if reportdir is not None:
+                outputfname = os.path.join(reportdir, casename(fname, content)+'.out')
+            key = caseinputhash(fname, content) if dedup else None
+            if key in computed:
+                original, report = computed[key]
+                row = dict(original, case=casename(fname, content), duplicateof=original['case'], walltime=0.)
+                if outputfname is not None and report not in [None, outputfname] and os.path.exists(report):
+                    shutil.copyfile(report, outputfname)
+            else:
+                if worker is not None:
+                    row = worker.run(fname, constraints, outputfname, timeout, content)
+                else:
+                    row = runcase(fname, constraints, outputfname, content)
+                if key is not None:
+                    row['inputhash'] = key
+                    if row['status'] in ['ok', 'skipped']:
+                        computed[key] = (row, outputfname)
+            pending.append((caseid, row))
+            if progress is not None:
+                progress(row)
+            if time.perf_counter()-lastcheckpoint >= checkpointinterval:
+                writecheckpoint(checkpoint, pending)
+                pending = []
+                lastcheckpoint = time.perf_counter()
+            yield row
+    finally:
+        writecheckpoint(checkpoint, pending)
+        if worker is not None:
+            worker.close()
+
+
+def writetable(rows, fname):
+    """writes result table rows to CSV file"""
+    with open(fname, 'w', newline='', encoding='UTF-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval='')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: '' if value is None else value for key, value in row.items()})
+
+
+def writemanifest(fname, fnames, shards, screen='all'):
+    """writes shard manifest for the input files (paths relative to the manifest folder) and returns it"""
+    folder = os.path.dirname(os.path.abspath(fname))
+    manifest = {'cases': [os.path.relpath(os.path.abspath(case), folder) for case in fnames], 'shards': shards,
+                'screen': screen}
+    os.makedirs(folder, exist_ok=True)
+    with open(fname, 'w', encoding='UTF-8') as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def readmanifest(fname):
+    """returns shard manifest with the input files as absolute paths"""
+    with open(fname, encoding='UTF-8') as f:
+        manifest = json.load(f)
+    folder = os.path.dirname(os.path.abspath(fname))
+    manifest['cases'] = [os.path.normpath(os.path.join(folder, case)) for case in manifest['cases']]
+    return manifest
+
+
+def shardcases(manifest, shard):
+    """returns input files of shard (1 to number of shards): every N-th case starting with case number shard"""
+    return manifest['cases'][shard-1::manifest['shards']]
+
+
+def shardfile(manifestfname, shard, shards):
+    """returns result (checkpoint) file of a shard, next to the manifest"""
+    return os.path.join(os.path.dirname(os.path.abspath(manifestfname)), 'shard-%d-of-%d.jsonl' % (shard, shards))
+
+
+def mergeshards(manifestfname):
+    """returns (result table rows of all cases with results in manifest order, input files without result)"""
+    manifest = readmanifest(manifestfname)
+    folder = os.path.dirname(os.path.abspath(manifestfname))
+    finished = {}
+    for shard in range(1, manifest['shards']+1):
+        finished.update(readcheckpoint(shardfile(manifestfname, shard, manifest['shards'])))
+    rows = [finished[checkpointid(case, folder)] for case in manifest['cases'] if checkpointid(case, folder) in finished]
+    missing = [case for case in manifest['cases'] if checkpointid(case, folder) not in finished]
+    return rows, missing
+
+
+def printrow(row):
+    if row.get('duplicateof'):
+        print('  {0:36s} {1:9s} duplicate of {2}'.format(row['case'], row['status'], row['duplicateof']))
+    elif row['status'] == 'ok':
+        print('  {0:36s} ok        {1:9.3f} s   price {2:.2f}'.format(row['case'], row['walltime'], row['price']))
+    elif row['status'] == 'skipped':
+        print('  {0:36s} skipped   {1:9.3f} s   {2}: {3}'.format(row['case'], row['walltime'], row['skipconstraint'], row['skipreason']))
+    else:
+        print('  {0:36s} {1:9s} {2:9.3f} s   {3}'.format(row['case'], row['status'], row['walltime'], row.get('message', '')))
+
+
+def main(argv=None):
+    import GEOPHIRESv2
+    parser = argparse.ArgumentParser(prog='python -m geophires.batch', description='GEOPHIRES v2.0 batch runs')
+    parser.add_argument('inputfiles', nargs='*', help='GEOPHIRES input files')
+    parser.add_argument('--output', default='results.csv', help='result table (CSV, default: results.csv)')
+    parser.add_argument('--screen', default='all',
+                        help="design constraints to screen: 'all' (default), 'none' or comma-separated names ("
+                             + ', '.join(constraint.name for constraint in GEOPHIRESv2.constraints) + ')')
+    parser.add_argument('--reports', metavar='DIR', help='write case reports to DIR')
+    parser.add_argument('--timeout', type=float, help='maximum run time per case in seconds (default: no timeout)')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='checkpoint file: finished cases are recorded in FILE and skipped when the run is repeated')
+    parser.add_argument('--checkpoint-interval', type=float, default=60.,
+                        help='seconds between checkpoint writes (default: 60)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='run cases with the same canonical input parameters only once (duplicates get its results)')
+    parser.add_argument('--manifest', metavar='FILE', help='shard manifest: written for the input files (with --shards), '
+                                                           'or read to run a shard (--shard) or merge the shard results (--merge)')
+    parser.add_argument('--shards', type=int, help='number of shards of the manifest written for the input files')
+    parser.add_argument('--shard', metavar='K/N', help='run shard K of N of the manifest')
+    parser.add_argument('--merge', action='store_true', help='merge the shard results of the manifest into the result table')
+    args = parser.parse_args(argv)
+    if args.manifest is None and (args.shards or args.shard or args.merge):
+        parser.error('--shards, --shard and --merge require --manifest')
+    if args.manifest is None or args.inputfiles:
+        if not args.inputfiles:
+            parser.error('no input files')
+    elif not (args.shard or args.merge):
+        parser.error('--manifest without input files requires --shard or --merge')
+    try:
+        constraints = GEOPHIRESv2.getconstraints(args.screen)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.reports:
+        os.makedirs(args.reports, exist_ok=True)
+
+    if args.manifest is not None and args.inputfiles:
+        if args.shard or args.merge:
+            parser.error('--shard and --merge read the input files from the manifest')
+        if not args.shards or args.shards < 1:
+            parser.error('--shards N (N >= 1) is required to write a manifest')
+        manifest = writemanifest(args.manifest, args.inputfiles, args.shards, args.screen)
+        print('Manifest with %d cases in %d shards written to %s' % (len(manifest['cases']), args.shards, args.manifest))
+        return 0
+
+    if args.merge:
+        rows, missing = mergeshards(args.manifest)
+        writetable(rows, args.output)
+        print('%d of %d cases merged. Result table written to %s' % (len(rows), len(rows)+len(missing), args.output))
+        if missing:
+            print('Error: %d cases have no result (first: %s)' % (len(missing), missing[0]))
+            return 1
+        return 0
+
+    if args.manifest is not None:
+        manifest = readmanifest(args.manifest)
+        try:
+            shard, shards = [int(x) for x in args.shard.split('/')]
+        except ValueError:
+            parser.error('--shard must be K/N, e.g. 3/16')
+        if shards != manifest['shards'] or not 1 <= shard <= shards:
+            parser.error('the manifest has %d shards (--shard K/%d with K from 1 to %d)' % ((manifest['shards'],)*3))
+        inputfiles = shardcases(manifest, shard)
+        constraints = GEOPHIRESv2.getconstraints(manifest['screen'])
+        args.checkpoint = shardfile(args.manifest, shard, shards)
+        print('GEOPHIRES batch shard %d of %d (%d cases)' % (shard, shards, len(inputfiles)))
+    else:
+        inputfiles = args.inputfiles
+        print('GEOPHIRES batch (%d cases)' % len(inputfiles))
+    finished = len(readcheckpoint(args.checkpoint))
+    if finished:
+        print('Resuming from checkpoint '+args.checkpoint+' (%d finished cases)' % finished)
+    rows = runbatch(inputfiles, constraints, args.reports, printrow, args.timeout, args.checkpoint,
+                    args.checkpoint_interval, args.dedup,
+                    os.path.dirname(os.path.abspath(args.manifest)) if args.manifest is not None else None)
+    if args.manifest is None:
+        writetable(rows, args.output)
+    counts = dict((status, sum(1 for row in rows if row['status'] == status)) for status in ['ok', 'skipped', 'error', 'timeout'])
+    print('%(ok)d ok, %(skipped)d skipped, %(error)d errors, %(timeout)d timeouts. ' % counts
+          + ('Result table written to '+args.output if args.manifest is None else 'Shard results written to '+args.checkpoint))
+    return 1 if counts['error'] or counts['timeout'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for GEOPHIRES v2.0
+
+Runs the example problems (Examples/example1.txt - example6.txt) and a set of
+synthetic input decks covering reservoir models 1-5, every end-use option and
+a range of time steps per year. For every case the wall time, peak memory and
+calculation time per simulation stage are recorded; the importtime case records
+the time to import GEOPHIRESv2 and its dependencies. Results are compared
+against a JSON baseline and the run fails when a case regresses by more than
+the given threshold.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.benchmark                 compare against Benchmarks/baseline.json
+    python -m geophires.benchmark --update        (re)write the baseline
+    python -m geophires.benchmark --cases resoption --repeat 5
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+defaultbaseline = os.path.join(rootdir, 'Benchmarks', 'baseline.json')
+
+#synthetic base case: EGS doublet field at 3 km depth producing electricity.
+#every synthetic case overrides a few of these parameters.
+basecase = [
+    ('Reservoir Model', 4),
+    ('Drawdown Parameter', 0.005),
+    ('Reservoir Depth', 3),
+    ('Number of Segments', 1),
+    ('Gradient 1', 50),
+    ('Maximum Temperature', 400),
+    ('Number of Production Wells', 2),
+    ('Number of Injection Wells', 2),
+    ('Production Well Diameter', 7),
+    ('Injection Well Diameter', 7),
+    ('Ramey Production Wellbore Model', 1),
+    ('Injection Wellbore Temperature Gain', 0),
+    ('Production Flow Rate per Well', 55),
+    ('Fracture Shape', 3),
+    ('Fracture Height', 900),
+    ('Reservoir Volume Option', 3),
+    ('Number of Fractures', 20),
+    ('Reservoir Volume', 1000000000),
+    ('Water Loss Fraction', 0.02),
+    ('Productivity Index', 5),
+    ('Injectivity Index', 5),
+    ('Injection Temperature', 50),
+    ('Maximum Drawdown', 1),
+    ('Reservoir Heat Capacity', 1000),
+    ('Reservoir Density', 2700),
+    ('Reservoir Thermal Conductivity', 2.7),
+    ('Reservoir Porosity', 0.04),
+    ('End-Use Option', 1),
+    ('Power Plant Type', 2),
+    ('Circulation Pump Efficiency', 0.8),
+    ('Utilization Factor', 0.9),
+    ('End-Use Efficiency Factor', 0.9),
+    ('CHP Fraction', 0.5),
+    ('CHP Bottoming Entering Temperature', 150),
+    ('Surface Temperature', 20),
+    ('Ambient Temperature', 20),
+    ('Plant Lifetime', 30),
+    ('Economic Model', 2),
+    ('Discount Rate', 0.05),
+    ('Inflation Rate During Construction', 0),
+    ('Well Drilling and Completion Capital Cost Adjustment Factor', 1),
+    ('Well Drilling Cost Correlation', 1),
+    ('Reservoir Stimulation Capital Cost Adjustment Factor', 1),
+    ('Surface Plant Capital Cost Adjustment Factor', 1),
+    ('Field Gathering System Capital Cost Adjustment Factor', 1),
+    ('Exploration Capital Cost Adjustment Factor', 1),
+    ('Wellfield O&M Cost Adjustment Factor', 1),
+    ('Surface Plant O&M Cost Adjustment Factor', 1),
+    ('Water Cost Adjustment Factor', 1),
+    ('Electricity Rate', 0.07),
+    ('Heat Rate', 0.02),
+    ('Print Output to Console', 0),
+    ('Time steps per year', 4),
+]
+
+#parameter overrides per reservoir model (resoption 5 reads the example reservoir output file, which has 4 time steps per year for 30 years)
+reservoiroverrides = {
+    1: [],
+    2: [],
+    3: [('Drawdown Parameter', 0.0001)],
+    4: [],
+    5: [('Reservoir Output File Name', 'Examples/ReservoirOutput.txt')],
+}
+
+
+def examplecases():
+    """returns list of (case name, input file) for the example problems"""
+    cases = []
+    for i in range(1, 7):
+        cases.append(('example%d' % i, os.path.join(rootdir, 'Examples', 'example%d.txt' % i)))
+    return cases
+
+
+def syntheticcases():
+    """returns list of (case name, parameter list) for the synthetic cases"""
+    cases = []
+    for resoption in [1, 2, 3, 4, 5]:
+        cases.append(('resoption%d' % resoption, [('Reservoir Model', resoption)] + reservoiroverrides[resoption]))
+    for enduseoption in [1, 2, 31, 32, 41, 42, 51, 52]:
+        cases.append(('enduseoption%d' % enduseoption, [('End-Use Option', enduseoption)]))
+    #the Laplace inversion of reservoir models 1 and 2 is repeated for every time step and dominates run time
+    #at high time resolution; the time step sweep therefore uses model 3 (per time step erf evaluation) and model 4 (vectorized)
+    for resoption in [3, 4]:
+        for timestepsperyear in [1, 12, 52, 100]:
+            cases.append(('timestepsperyear%d-resoption%d' % (timestepsperyear, resoption),
+                          [('Reservoir Model', resoption), ('Time steps per year', timestepsperyear)] + reservoiroverrides[resoption]))
+    for timestepsperyear in [1, 12]:
+        cases.append(('timestepsperyear%d-resoption1' % timestepsperyear,
+                      [('Reservoir Model', 1), ('Time steps per year', timestepsperyear)]))
+    for resoption in [1, 2]:
+        cases.append(('adaptivetimestepping-resoption%d' % resoption,
+                      [('Reservoir Model', resoption), ('Time steps per year', 12), ('Adaptive Time Stepping', 1)]))
+    #strongly drawn-down reservoirs (redrilling after 13 and 11 years): the Laplace inversion stops at the maximum drawdown
+    for resoption, overrides in [(1, [('Number of Fractures', 6)]), (2, [])]:
+        cases.append(('lazyreservoir-resoption%d' % resoption,
+                      [('Reservoir Model', resoption), ('Time steps per year', 12), ('Maximum Drawdown', 0.02),
+                       ('Lazy Reservoir Evaluation', 1)] + overrides))
+    #well field of 60 production and 30 injection wells with individual flow rates and diameters
+    cases.append(('wellfield-60wells', [('Number of Production Wells', 60), ('Number of Injection Wells', 30),
+                                        ('Production Well Flow Rates', ';'.join('%d' % (30+(7*i) % 41) for i in range(60))),
+                                        ('Production Well Diameters', ';'.join('%d' % (6+i % 5) for i in range(60))),
+                                        ('Injection Well Diameters', ';'.join('%d' % (7+i % 3) for i in range(30)))]))
+    #hourly dispatch of direct-use heat and CHP against the 8760 hour heat demand profile of the examples
+    for enduseoption in [2, 52]:
+        cases.append(('hourlydispatch-enduseoption%d' % enduseoption,
+                      [('End-Use Option', enduseoption), ('Time steps per year', 12),
+                       ('Hourly Heat Demand File Name', os.path.join(rootdir, 'Examples', 'HeatDemand.txt'))]))
+    return cases
+
+
+def writedeck(parameters, fname):
+    """writes GEOPHIRES input file with base case parameters updated with the provided parameter list"""
+    deck = dict(basecase)
+    deck.update(dict(parameters))
+    with open(fname, 'w', encoding='UTF-8') as f:
+        f.write('GEOPHIRES v2.0 Input File (synthetic benchmark case)\n')
+        for key, value in deck.items():
+            f.write('%s,%s,\n' % (key, value))
+
+
+def runworker(fname):
+    """runs one simulation in the current process and returns timing and memory statistics (called in a child process)"""
+    tmpdir = tempfile.TemporaryDirectory()
+    stdout = sys.stdout
+    result = {'status': 'ok'}
+    tic = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            import GEOPHIRESv2
+            simulation = GEOPHIRESv2.runGEOPHIRES(fname, os.path.join(tmpdir.name, 'HDR.out'))
+        result['walltime'] = time.perf_counter()-tic
+        stagetimes = simulation.stagetimes
+        #startup: importing GEOPHIRES and its dependencies
+        result['stages'] = dict({'startup': result['walltime'] - sum(stagetimes.values())}, **stagetimes)
+        result['counters'] = simulation.profile.counters
+    except SystemExit:
+        result['status'] = 'error'
+        result['message'] = 'simulation aborted'
+    except Exception as e:
+        result['status'] = 'error'
+        result['message'] = '%s: %s' % (type(e).__name__, e)
+    finally:
+        sys.stdout = stdout
+        tmpdir.cleanup()
+    result['peakmemory'] = peakmemory()
+    return result
+
+
+def peakmemory():
+    """returns peak resident memory of current process in MB (None if not available on this platform)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':    #bytes on macOS, kilobytes on Linux
+        return maxrss/1E6
+    return maxrss/1E3
+
+
+def runcase(fname, repeat):
+    """runs case repeat times, each in a fresh interpreter, and keeps statistics of the fastest run"""
+    best = None
+    for i in range(0, repeat):
+        tic = time.perf_counter()
+        process = subprocess.run([sys.executable, '-m', 'geophires.benchmark', '--worker', fname],
+                                 cwd=rootdir, capture_output=True, text=True)
+        processtime = time.perf_counter()-tic
+        try:
+            result = json.loads(process.stdout.strip().splitlines()[-1])
+        except (ValueError, IndexError):
+            result = {'status': 'error', 'message': process.stderr.strip()[-500:]}
+        if result['status'] != 'ok':
+            return result
+        result['processtime'] = processtime
+        if best is None or result['walltime'] < best['walltime']:
+            best = result
+    return best
+
+
+def runimporttime(repeat):
+    """measures the import time of GEOPHIRESv2 (python -X importtime) in fresh interpreters and keeps the fastest run
+
+    stages holds the cumulative import time of every module imported directly by GEOPHIRESv2 and the time spent
+    in GEOPHIRESv2 itself"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)    #import from cached bytecode, as in an installed copy
+    best = None
+    for i in range(0, repeat+1):    #the first run writes the bytecode cache and is not counted
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import GEOPHIRESv2'],
+                                 cwd=rootdir, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            return {'status': 'error', 'message': process.stderr.strip()[-500:]}
+        #lines "import time: self [us] | cumulative | name", nested imports are indented and listed before their parent
+        imports = {}
+        result = None
+        for line in process.stderr.splitlines():
+            fields = line.split('|')
+            if not line.startswith('import time:') or len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            name = fields[2].rstrip()
+            depth = (len(name)-len(name.lstrip())-1)//2
+            if depth == 1:
+                imports[name.strip()] = int(fields[1])/1E6
+            elif depth == 0:
+                if name.strip() == 'GEOPHIRESv2':
+                    imports['GEOPHIRESv2'] = int(fields[0].split(':')[1])/1E6
+                    result = {'status': 'ok', 'walltime': int(fields[1])/1E6, 'stages': imports, 'counters': {},
+                              'peakmemory': None}
+                imports = {}
+        if result is None:
+            return {'status': 'error', 'message': 'no import time reported for GEOPHIRESv2'}
+        if i > 0 and (best is None or result['walltime'] < best['walltime']):
+            best = result
+    return best
+
+
+def runsuite(pattern=None, repeat=3):
+    """runs all (or all matching) benchmark cases and returns dictionary with results"""
+    results = {}
+    if pattern is None or re.search(pattern, 'importtime'):
+        results['importtime'] = runimporttime(repeat)
+        printcase('importtime', results['importtime'])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cases = examplecases()
+        for name, parameters in syntheticcases():
+            fname = os.path.join(tmpdir, name+'.txt')
+            writedeck(parameters, fname)
+            cases.append((name, fname))
+        for name, fname in cases:
+            if pattern is not None and not re.search(pattern, name):
+                continue
+            results[name] = runcase(fname, repeat)
+            printcase(name, results[name])
+    return results
+
+
+def printcase(name, result):
+    if result['status'] == 'ok':
+        print('  {0:36s} {1:9.3f} s {2:9.1f} MB   {3}'.format(name, result['walltime'], result['peakmemory'] or 0.,
+              ', '.join('%s %.3f' % (stage, t) for stage, t in result['stages'].items() if t >= 0.001)))
+    else:
+        print('  {0:36s}   {1}: {2}'.format(name, result['status'], result.get('message', '')))
+
+
+def comparebaseline(results, baseline, threshold=0.25, memorythreshold=0.10, mindelta=0.005):
+    """returns list of regressions (case name, metric, baseline value, new value) with respect to baseline
+
+    a case regresses if it ran in the baseline and fails now (metric 'status', with the baseline and new status),
+    if its wall time grows by more than threshold (relative) and mindelta (absolute, in s), or if its peak memory
+    grows by more than memorythreshold (relative). Cases that failed in the baseline are not compared."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('cases', {}).get(name)
+        if reference is None or reference['status'] != 'ok':
+            continue
+        if result['status'] != 'ok':
+            regressions.append((name, 'status', reference['status'], result['status']))
+            continue
+        if result['walltime'] > reference['walltime']*(1.+threshold) and result['walltime']-reference['walltime'] > mindelta:
+            regressions.append((name, 'walltime', reference['walltime'], result['walltime']))
+        if result['peakmemory'] is not None and reference['peakmemory'] is not None:
+            if result['peakmemory'] > reference['peakmemory']*(1.+memorythreshold):
+                regressions.append((name, 'peakmemory', reference['peakmemory'], result['peakmemory']))
+    return regressions
+
+
+def environment():
+    try:
+        import numpy
+        numpyversion = numpy.__version__
+    except ImportError:
+        numpyversion = None
+    return {'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+            'python': platform.python_version(),
+            'numpy': numpyversion,
+            'platform': platform.platform()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.benchmark', description='GEOPHIRES v2.0 benchmark suite')
+    parser.add_argument('--baseline', default=defaultbaseline, help='baseline JSON file (default: Benchmarks/baseline.json)')
+    parser.add_argument('--update', action='store_true', help='write results to baseline file instead of comparing')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--cases', help='only run cases matching this regular expression')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per case; fastest run is kept (default: 3)')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative wall time increase (default: 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=0.10, help='allowed relative peak memory increase (default: 0.10)')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(runworker(args.worker)))
+        return 0
+
+    print('GEOPHIRES benchmark (%d run(s) per case)' % args.repeat)
+    results = runsuite(args.cases, args.repeat)
+    report = dict(environment(), repeat=args.repeat, cases=results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    if args.update:
+        if args.cases and os.path.exists(args.baseline):    #partial run only updates the cases that were run
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+            baseline['cases'].update(results)
+            report = dict(baseline, **environment())
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=1)
+        print('Baseline written to '+args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('Warning: no baseline file ('+args.baseline+') found. Run with --update to create one.')
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = comparebaseline(results, baseline, args.threshold, args.memory_threshold)
+    if regressions:
+        print('Regressions with respect to baseline ('+args.baseline+'):')
+        for name, metric, reference, value in regressions:
+            if metric == 'status':
+                print('  {0:36s} {1:10s} {2:>10s} -> {3:>10s} ({4})'.format(name, metric, reference, value,
+                                                                          results[name].get('message', '')))
+                continue
+            print('  {0:36s} {1:10s} {2:10.3f} -> {3:10.3f} ({4:+.0f}%)'.format(name, metric, reference, value, (value/reference-1)*100))
+        return 1
+    print('No regressions with respect to baseline ('+args.baseline+').')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
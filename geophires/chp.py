@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+CHP fraction sweeps of the parallel cogeneration cycle with GEOPHIRES v2.0
+
+In the parallel cogeneration cycle (end-use options 51 and 52) the CHP
+fraction splits the produced flow between the power plant and the direct-use
+application: ElectricityProduced, HeatProduced and HeatExtractedTowardsElectricity
+are linear in chpfraction, and reservoir, wellbore and hydraulics do not depend
+on it. The sweep evaluates all fractions in one call of the vectorized engine
+(geophires.vectorized): the stages up to the hydraulics have no per-fraction
+inputs and are evaluated once, surface plant, costs, production and Price are
+evaluated for all fractions at once. Plant cost brackets (flash plants) and
+the labor cost correlation are evaluated per fraction with np.where, so the
+piecewise behavior of the correlations is kept.
+
+Price is the levelized cost of electricity (option 51, heat sales as income) or
+heat (option 52, electricity sales as income) of the base case input file.
+Once the income of the by-product exceeds the costs, Price turns negative and
+keeps falling towards the fraction where the production of the priced product
+vanishes, so the minimum of Price is no optimum. The sweep reports the
+break-even fraction where Price reaches zero or, if Price stays positive, the
+lowest Price (among the fractions with positive net production of the priced
+product).
+--verify runs the reference implementation (GEOPHIRESv2.py) at a few fractions
+and reports the maximum relative deviation of Price.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.chp base.txt --fractions 0.05:0.95:181 --output chp.csv [--verify 5]
+"""
+
+import argparse
+import contextlib
+import copy
+import csv
+import io
+import sys
+import time
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import vectorized
+
+#valid range of the CHP fraction (as in GEOPHIRESv2.readinput)
+fractionrange = (0.0001, 0.9999)
+
+
+def readparameters(fname):
+    """returns input parameters of an input file (input warnings suppressed)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GEOPHIRESv2.readinput(GEOPHIRESv2.readinputfile(fname))
+
+
+def checkparameters(parameters, fractions):
+    if parameters['enduseoption'] not in [51, 52]:
+        raise ValueError('CHP fraction sweeps need the parallel cogeneration cycle (End-Use Option 51 or 52), not %d'
+                         % parameters['enduseoption'])
+    fractions = np.asarray(fractions, dtype=float)
+    if fractions.ndim != 1 or len(fractions) == 0:
+        raise ValueError('CHP fractions must be a non-empty list of values')
+    if np.any(fractions < fractionrange[0]) or np.any(fractions > fractionrange[1]):
+        raise ValueError('CHP fractions must be between %g and %g' % fractionrange)
+    return fractions
+
+
+def fractionsweep(parameters, fractions):
+    """evaluates the base case parameters for all CHP fractions at once, returns GEOPHIRESv2.SimulationResult of the
+    vectorized engine with one row per fraction"""
+    fractions = checkparameters(parameters, fractions)
+    with np.errstate(all='ignore'):
+        return vectorized.simulate(parameters, {'chpfraction': fractions})
+
+
+def pricedrows(result):
+    """returns boolean array of the fractions with finite Price and positive average net production of the priced
+    product (electricity for option 51, heat for option 52)"""
+    product = result.NetElectricityProduced if result.enduseoption == 51 else result.HeatProduced
+    return np.isfinite(result.Price) & (np.average(product, axis=1) > 0)
+
+
+def bestfraction(result):
+    """returns index of the fraction with the lowest positive Price (see pricedrows), None if there is none"""
+    Price = np.where(pricedrows(result) & (result.Price > 0), result.Price, np.inf)
+    return int(np.argmin(Price)) if np.any(np.isfinite(Price)) else None
+
+
+def breakeven(fractions, result):
+    """returns CHP fraction (linearly interpolated) where Price first changes from positive to zero or negative
+    (the by-product income covers all costs), None if Price does not change sign"""
+    index = np.flatnonzero(pricedrows(result))
+    fractions, Price = np.asarray(fractions)[index], result.Price[index]
+    for i in range(len(Price)-1):
+        if index[i+1] == index[i]+1 and (Price[i] > 0) != (Price[i+1] > 0):
+            return float(fractions[i] + (fractions[i+1]-fractions[i])*Price[i]/(Price[i]-Price[i+1]))
+    return None
+
+
+def verify(parameters, fractions, Price):
+    """runs the reference implementation at fractions, returns maximum relative deviation of Price from the sweep
+    result Price (same order as fractions)"""
+    deviation = 0.
+    for fraction, price in zip(fractions, Price):
+        variables = dict(copy.deepcopy(parameters), chpfraction=float(fraction))
+        with np.errstate(all='ignore'), contextlib.redirect_stdout(io.StringIO()):
+            GEOPHIRESv2.runstages(variables)
+        deviation = max(deviation, abs(price/variables['Price']-1))
+    return deviation
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.chp', description='GEOPHIRES v2.0 CHP fraction sweeps')
+    parser.add_argument('inputfile', help='base case input file (End-Use Option 51 or 52)')
+    parser.add_argument('--fractions', default='0.01:0.99:197', metavar='START:STOP:NUMBER',
+                        help='evenly spaced CHP fractions (default: 0.01:0.99:197)')
+    parser.add_argument('--output', default='chp.csv', help='result table (CSV, default: chp.csv)')
+    parser.add_argument('--verify', type=int, default=0, metavar='N',
+                        help='check Price against GEOPHIRESv2.py at N evenly spaced fractions (default: 0)')
+    args = parser.parse_args(argv)
+    try:
+        start, stop, number = args.fractions.split(':')
+        fractions = np.linspace(float(start), float(stop), int(number))
+        parameters = readparameters(args.inputfile)
+        checkparameters(parameters, fractions)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    tic = time.perf_counter()
+    result = fractionsweep(parameters, fractions)
+    walltime = time.perf_counter()-tic
+    rows = {'chpfraction': fractions, 'price': result.Price, 'capitalcost': result.Ccap, 'oamcost': result.Coam,
+            'averagenetelectricity': np.average(result.NetElectricityProduced, axis=1),
+            'averageheat': np.average(result.HeatProduced, axis=1)}
+    with open(args.output, 'w', newline='', encoding='UTF-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(rows))
+        writer.writerows(zip(*rows.values()))
+    print('%d CHP fractions evaluated in %.3f s, result table written to %s' % (len(fractions), walltime, args.output))
+    #with a break-even the lowest positive Price only lies next to it
+    fraction = breakeven(fractions, result)
+    best = bestfraction(result)
+    if fraction is not None:
+        print('Break-even at CHP fraction %.4f (%s income covers all costs, Price 0)'
+              % (fraction, 'heat' if parameters['enduseoption'] == 51 else 'electricity'))
+    elif best is not None:
+        print('Lowest Price %.4f %s at CHP fraction %.4f' % (result.Price[best], 'cents/kWh' if parameters['enduseoption'] == 51
+                                                               else '$/MMBTU', fractions[best]))
+    if args.verify > 0:
+        index = np.unique(np.linspace(0, len(fractions)-1, args.verify).round().astype(int))
+        print('Maximum relative deviation of Price from GEOPHIRESv2.py at %d fractions: %.2e'
+              % (len(index), verify(parameters, fractions[index], result.Price[index])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Numerical-equivalence harness for accelerated GEOPHIRES v2.0 engines
+
+Generates randomized valid parameter sets for every combination of reservoir
+model (1-5), end-use option, power plant type and economic model, runs them
+through the reference implementation (the stages of GEOPHIRESv2.py, one
+parameter set at a time) and through an accelerated engine (all parameter sets
+of a combination at once), and reports the maximum relative error of
+ProducedTemperature, NetElectricityProduced, Ccap, Coam and Price together with
+the speedup. The relative error of a parameter set is the maximum absolute
+difference over the time series, divided by the largest absolute reference
+value. The run fails when an error exceeds the tolerance.
+
+Accelerated engines are registered in `engines` (name -> function taking a
+list of parameter sets and returning the variables of every set).
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.equivalence                                   all combinations, 3 parameter sets each
+    python -m geophires.equivalence --resoption 3,4 --samples 20 --seed 1 --output equivalence.json
+    python -m geophires.equivalence --engine vectorized-numba         compiled kernels (geophires.kernels)
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import itertools
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import benchmark, kernels, vectorized
+
+#compared simulation variables
+outputs = ['ProducedTemperature', 'NetElectricityProduced', 'Ccap', 'Coam', 'Price']
+
+#option values of the combinations (reservoir model 6, TOUGH2, is not supported by the accelerated engines)
+options = {
+    'resoption': [1, 2, 3, 4, 5],
+    'enduseoption': [1, 2, 31, 32, 41, 42, 51, 52],
+    'pptype': [1, 2, 3, 4],
+    'econmodel': [1, 2, 3],
+}
+optionnames = {'resoption': 'Reservoir Model', 'enduseoption': 'End-Use Option', 'pptype': 'Power Plant Type',
+               'econmodel': 'Economic Model'}
+
+#randomized input parameters (uniformly distributed between low and high), chosen such that every parameter set is
+#valid input and the initial reservoir temperature is above the injection temperature
+parameterranges = {
+    'Reservoir Depth': (2.5, 5),
+    'Gradient 1': (35, 70),
+    'Maximum Temperature': (250, 400),
+    'Surface Temperature': (5, 25),
+    'Ambient Temperature': (5, 25),
+    'Production Flow Rate per Well': (30, 80),
+    'Production Well Diameter': (6, 10),
+    'Injection Well Diameter': (6, 10),
+    'Injection Temperature': (40, 70),
+    'Fracture Height': (500, 1000),
+    'Reservoir Volume': (5E8, 2E9),
+    'Reservoir Heat Capacity': (900, 1100),
+    'Reservoir Density': (2500, 2900),
+    'Reservoir Thermal Conductivity': (2, 3.5),
+    'Reservoir Porosity': (0.02, 0.1),
+    'Productivity Index': (3, 10),
+    'Injectivity Index': (3, 10),
+    'Water Loss Fraction': (0, 0.05),
+    'Maximum Drawdown': (0.05, 1),
+    'Utilization Factor': (0.8, 1),
+    'Circulation Pump Efficiency': (0.7, 0.9),
+    'End-Use Efficiency Factor': (0.8, 1),
+    'CHP Fraction': (0.2, 0.8),
+    'CHP Bottoming Entering Temperature': (120, 160),
+    'Well Drilling and Completion Capital Cost Adjustment Factor': (0.8, 1.2),
+    'Surface Plant Capital Cost Adjustment Factor': (0.8, 1.2),
+    'Surface Plant O&M Cost Adjustment Factor': (0.8, 1.2),
+    'Electricity Rate': (0.03, 0.12),
+    'Heat Rate': (0.01, 0.04),
+    'Fixed Charge Rate': (0.05, 0.15),
+    'Discount Rate': (0.03, 0.1),
+    'Fraction of Investment in Bonds': (0.4, 0.8),
+    'Inflated Bond Interest Rate': (0.04, 0.1),
+    'Inflated Equity Interest Rate': (0.08, 0.15),
+    'Inflation Rate': (0.01, 0.03),
+    'Combined Income Tax Rate': (0.2, 0.4),
+    'Gross Revenue Tax Rate': (0, 0.05),
+    'Investment Tax Credit Rate': (0, 0.1),
+    'Property Tax Rate': (0, 0.02),
+}
+
+#drawdown parameter ranges of reservoir models 3 (kg/s/m2) and 4 (1/year)
+drawdownranges = {3: (2E-5, 2E-4), 4: (0.002, 0.01)}
+
+
+def combinations(selected=None):
+    """returns list of option combinations (dictionaries), restricted to the selected option values
+    (dictionary option -> list of values); the power plant type only varies for end-use options producing electricity"""
+    values = dict(options, **(selected or {}))
+    combos = []
+    for resoption, enduseoption, pptype, econmodel in itertools.product(*[values[name] for name in options]):
+        if enduseoption == 2 and pptype != values['pptype'][0]:
+            continue
+        combos.append({'resoption': resoption, 'enduseoption': enduseoption, 'pptype': pptype, 'econmodel': econmodel})
+    return combos
+
+
+def parametersets(combo, samples, rng, timestepsperyear=1):
+    """returns list of samples randomized parameter sets (as read by GEOPHIRESv2.readinput) of option combination combo"""
+    deck = dict(benchmark.basecase)
+    deck.update(dict(benchmark.reservoiroverrides[combo['resoption']]))
+    deck.update((optionnames[name], value) for name, value in combo.items())
+    #the reservoir output file of reservoir model 5 has 4 time steps per year
+    deck['Time steps per year'] = 4 if combo['resoption'] == 5 else timestepsperyear
+    sets = []
+    for i in range(0, samples):
+        for name, (low, high) in parameterranges.items():
+            deck[name] = rng.uniform(low, high)
+        if combo['resoption'] in drawdownranges:
+            deck['Drawdown Parameter'] = rng.uniform(*drawdownranges[combo['resoption']])
+        content = ['%s,%s,\n' % (name, value) for name, value in deck.items()]
+        with contextlib.redirect_stdout(io.StringIO()):
+            sets.append(GEOPHIRESv2.readinput(content))
+    return sets
+
+
+def reference(sets):
+    """runs every parameter set through the stages of GEOPHIRESv2.py, returns list of simulation variables
+    (None for parameter sets for which the simulation aborted)"""
+    results = []
+    for parameters in sets:
+        variables = copy.deepcopy(parameters)
+        try:
+            with np.errstate(all='ignore'), contextlib.redirect_stdout(io.StringIO()):
+                GEOPHIRESv2.runstages(variables)
+        except SystemExit:
+            variables = None
+        results.append(variables)
+    return results
+
+
+def stackparameters(sets):
+    """returns (base parameters, overrides) with per-scenario values of the parameters that differ between the sets"""
+    overrides = {}
+    for name, value in sets[0].items():
+        values = [parameters[name] for parameters in sets]
+        if all(x == value for x in values):
+            continue
+        if name in vectorized.discreteparameters:
+            raise ValueError("parameter sets differ in option '%s'" % name)
+        if name in ['gradient', 'layerthickness']:
+            overrides[name] = [np.array(layer, dtype=float) for layer in zip(*values)]
+        else:
+            overrides[name] = np.array(values, dtype=float)
+    return sets[0], overrides
+
+
+def runvectorized(sets):
+    """runs all parameter sets at once with the vectorized engine, returns list of simulation variables"""
+    parameters, overrides = stackparameters(sets)
+    with np.errstate(all='ignore'), contextlib.redirect_stdout(io.StringIO()):
+        variables = vectorized.simulate(parameters, overrides).variables
+    results = []
+    for i in range(0, len(sets)):
+        results.append(dict((name, value[i] if isinstance(value, np.ndarray) and value.ndim > 0 else value)
+                            for name, value in variables.items() if name in outputs))
+    return results
+
+
+def runvectorizednumba(sets):
+    """runs all parameter sets at once with the vectorized engine using the compiled kernels (numba backend)"""
+    previous = kernels.backend
+    if kernels.setbackend('numba') != 'numba':
+        raise RuntimeError('Numba is not installed')
+    try:
+        return runvectorized(sets)
+    finally:
+        kernels.setbackend(previous)
+
+
+#accelerated engines: name -> function(list of parameter sets) returning the simulation variables of every set
+engines = {'vectorized': runvectorized, 'vectorized-numba': runvectorizednumba}
+
+
+def relativeerror(reference, value):
+    """returns maximum absolute difference divided by the largest absolute reference value
+    (infinite if shapes differ or only one of both is NaN)"""
+    reference = np.asarray(reference, dtype=float)
+    value = np.asarray(value, dtype=float)
+    if reference.shape != value.shape or np.any(np.isnan(reference) != np.isnan(value)):
+        return math.inf
+    valid = ~np.isnan(reference)
+    if not np.any(valid):
+        return 0.
+    difference = np.max(np.abs(reference[valid]-value[valid]))
+    scale = np.max(np.abs(reference[valid]))
+    return float(difference/scale) if scale > 0 else float(difference)
+
+
+def compare(combo, sets, engine):
+    """runs parameter sets through reference and accelerated engine, returns dictionary with errors and timings"""
+    tic = time.perf_counter()
+    referenceresults = reference(sets)
+    referencetime = time.perf_counter()-tic
+    valid = [i for i, variables in enumerate(referenceresults) if variables is not None]
+    result = dict(combo, status='ok', samples=len(sets), aborted=len(sets)-len(valid), referencetime=referencetime)
+    if not valid:
+        return dict(result, status='aborted', message='all parameter sets aborted in the reference implementation')
+    tic = time.perf_counter()
+    try:
+        engineresults = engines[engine]([sets[i] for i in valid])
+    except Exception as e:
+        return dict(result, status='error', message='%s: %s' % (type(e).__name__, e))
+    result['enginetime'] = time.perf_counter()-tic
+    #reference time of the parameter sets the engine ran
+    result['speedup'] = referencetime*len(valid)/len(sets)/result['enginetime']
+    result['errors'] = {}
+    for name in outputs:
+        errors = [relativeerror(referenceresults[i][name], variables.get(name))
+                  for i, variables in zip(valid, engineresults) if referenceresults[i].get(name) is not None]
+        if errors:
+            result['errors'][name] = max(errors)
+    return result
+
+
+def label(result):
+    return 'resoption %d, enduse %d, pptype %d, econmodel %d' % (result['resoption'], result['enduseoption'],
+                                                                  result['pptype'], result['econmodel'])
+
+
+def printheader():
+    print('  {0:48s} {1}  {2:>8s}'.format('', ' '.join('%10s' % name[:10] for name in outputs), 'speedup'))
+
+
+def printresult(result):
+    if result['status'] != 'ok':
+        print('  {0:48s} {1}: {2}'.format(label(result), result['status'], result.get('message', '')))
+        return
+    errors = ' '.join('%10.1e' % result['errors'][name] if name in result['errors'] else '%10s' % '-' for name in outputs)
+    print('  {0:48s} {1}  {2:8.1f}'.format(label(result), errors, result['speedup']))
+
+
+def summary(results, tolerance):
+    """prints worst errors per output and speedup per reservoir model, returns list of failed combinations"""
+    failed = [result for result in results if result['status'] != 'ok' or
+              any(error > tolerance for error in result.get('errors', {}).values())]
+    print('Maximum relative error:')
+    for name in outputs:
+        errors = [(result['errors'][name], result) for result in results if name in result.get('errors', {})]
+        if errors:
+            error, worst = max(errors, key=lambda x: x[0])
+            print('  {0:24s} {1:9.2e}   ({2})'.format(name, error, label(worst)))
+    print('Speedup (total reference time / total engine time):')
+    for resoption in sorted(set(result['resoption'] for result in results)):
+        timed = [result for result in results if result['resoption'] == resoption and 'enginetime' in result]
+        if timed:
+            referencetime = sum(result['referencetime']*(1-result['aborted']/result['samples']) for result in timed)
+            enginetime = sum(result['enginetime'] for result in timed)
+            print('  resoption {0:d}: {1:8.1f} ({2:.2f} s / {3:.2f} s)'.format(resoption, referencetime/enginetime,
+                                                                            referencetime, enginetime))
+    aborted = sum(result['aborted'] for result in results)
+    if aborted:
+        print('%d parameter set(s) aborted in the reference implementation and were not compared' % aborted)
+    return failed
+
+
+def optionlist(text):
+    return [int(x) for x in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.equivalence',
+                                     description='GEOPHIRES v2.0 numerical-equivalence harness for accelerated engines')
+    parser.add_argument('--engine', default='vectorized', choices=sorted(engines), help='accelerated engine (default: vectorized)')
+    parser.add_argument('--samples', type=int, default=3, help='parameter sets per option combination (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('--tolerance', type=float, default=1E-6, help='maximum allowed relative error (default: 1e-6)')
+    parser.add_argument('--timestepsperyear', type=int, default=1,
+                        help='time steps per year (default: 1; reservoir model 5 always uses 4)')
+    for name in options:
+        parser.add_argument('--'+name, type=optionlist, help='only these %s values (comma-separated)' % name)
+    parser.add_argument('--output', help='write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    selected = dict((name, getattr(args, name)) for name in options if getattr(args, name))
+    for name, values in selected.items():
+        if not set(values) <= set(options[name]):
+            parser.error('%s must be in %s' % (name, options[name]))
+    os.chdir(benchmark.rootdir)    #file names in the input parameters are relative to the GEOPHIRES folder
+
+    rng = np.random.default_rng(args.seed)
+    combos = combinations(selected)
+    print('GEOPHIRES equivalence: %s engine against reference, %d combinations x %d parameter sets (seed %d)'
+          % (args.engine, len(combos), args.samples, args.seed))
+    printheader()
+    results = []
+    for combo in combos:
+        results.append(compare(combo, parametersets(combo, args.samples, rng, args.timestepsperyear), args.engine))
+        printresult(results[-1])
+    failed = summary(results, args.tolerance)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'engine': args.engine, 'seed': args.seed, 'samples': args.samples, 'tolerance': args.tolerance,
+                       'results': results}, f, indent=1)
+    if failed:
+        print('%d combination(s) exceed the tolerance (%.1e) or failed' % (len(failed), args.tolerance))
+        return 1
+    print('All combinations within tolerance (%.1e).' % args.tolerance)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
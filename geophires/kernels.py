@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Compiled numerical kernels of the vectorized GEOPHIRES v2.0 engine
+
+The small numerical kernels the vectorized engine (geophires.vectorized) calls
+for every scenario and time step: the error function of the drawdown parameter
+reservoir model, Ramey's wellbore model through the layers of the thermal
+profile, the power plant correlations (utilization efficiency etau and
+reinjection temperature ReinjTemp) and the annual energy integration. Here they
+are written as plain loops over scenarios and time steps and compiled with
+Numba into fused loops, which need no temporary arrays (e.g. of shape
+(scenarios, time steps, layers) in the wellbore model). The Colebrook-White
+friction factor stays a NumPy expression with both backends: NumPy evaluates
+its logarithms and powers with SIMD instructions, which a compiled scalar loop
+does not beat.
+
+Backends (one switch for the whole engine):
+    numpy   NumPy array expressions of geophires.vectorized (default)
+    numba   the kernels below compiled with Numba (compiled on first use and
+            cached on disk); falls back to numpy with a warning if Numba is
+            not installed
+
+The backend is selected with the environment variable GEOPHIRES_BACKEND or in
+Python with setbackend. Both backends give the same results within rounding
+(checked with python -m geophires.equivalence --engine vectorized-numba).
+
+Usage:
+    from geophires import kernels
+    kernels.setbackend('numba')
+"""
+
+import math
+import os
+
+import numpy as np
+
+#selected backend ('numpy' or 'numba') and compiled kernels (name -> function) of the numba backend
+backend = 'numpy'
+compiled = None
+
+
+def erfloop(x, result):
+    for i in range(x.size):
+        result[i] = math.erf(x[i])
+
+
+def plantcorrelationloop(coefficients, TenteringPP, Tenv, result):
+    #coefficients: (ambient temperature below or above 15 deg.C, lower or upper bound, C2/C1/C0)
+    n, nt = TenteringPP.shape
+    for i in range(n):
+        for t in range(nt):
+            T = TenteringPP[i, t]
+            above = 0 if Tenv[i, t] < 15. else 1
+            Tfraction = (Tenv[i, t]-5.)/10. if above == 0 else (Tenv[i, t]-15.)/10.
+            C2, C1, C0 = coefficients[above, 0, 0], coefficients[above, 0, 1], coefficients[above, 0, 2]
+            D2, D1, D0 = coefficients[above, 1, 0], coefficients[above, 1, 1], coefficients[above, 1, 2]
+            result[i, t] = (1.-Tfraction)*(C2*T**2 + C1*T + C0) + Tfraction*(D2*T**2 + D1*T + D0)
+
+
+def annualenergyloop(power, timestepsperyear, dx, result):
+    #trapezoidal rule per year
+    n, years = result.shape
+    for i in range(n):
+        for year in range(years):
+            energy = 0.
+            for k in range(year*timestepsperyear, (year+1)*timestepsperyear):
+                energy += dx*(power[i, k+1] + power[i, k])/2.0
+            result[i, year] = energy
+
+
+def wellboretemperatureloop(topdepth, toptemperature, gradient, depth, Tfluid, rameyA, result):
+    #Ramey's model layer by layer from the reservoir to the surface (see GEOPHIRESv2.Geotherm.wellboretemperature):
+    #the temperature gain of a layer decays with exp(-L/A) of the layers above it
+    n, nt = Tfluid.shape
+    layers = topdepth.shape[1]
+    for i in range(n):
+        for t in range(nt):
+            A = rameyA[i, t]
+            gain = 0.
+            abovedecay = 1.
+            for j in range(layers):
+                bottom = topdepth[i, j+1] if j+1 < layers else math.inf
+                length = max(min(bottom, depth[i, 0]) - topdepth[i, j], 0.)
+                decay = math.exp(-length/A)
+                gA = gradient[i, j]*A
+                gain += (toptemperature[i, j] + gA - (toptemperature[i, j] + gradient[i, j]*length + gA)*decay)*abovedecay
+                abovedecay *= decay
+            result[i, t] = Tfluid[i, t]*abovedecay + gain
+
+
+#kernels compiled by the numba backend
+loops = {'erf': erfloop, 'plantcorrelation': plantcorrelationloop, 'annualenergy': annualenergyloop,
+         'wellboretemperature': wellboretemperatureloop}
+
+
+def compilekernels():
+    """compiles the kernels with Numba, returns them (None if Numba is not installed)"""
+    global compiled
+    if compiled is None:
+        try:
+            import numba
+        except ImportError:
+            return None
+        compiled = dict((name, numba.njit(cache=True, error_model='numpy')(loop)) for name, loop in loops.items())
+    return compiled
+
+
+def setbackend(name):
+    """selects the backend of the vectorized engine ('numpy' or 'numba') and returns the backend in use"""
+    global backend
+    if name not in ['numpy', 'numba']:
+        raise ValueError("unknown backend '%s' (numpy or numba)" % name)
+    if name == 'numba' and compilekernels() is None:
+        print('Warning: Numba is not installed. GEOPHIRES will use the NumPy backend')
+        name = 'numpy'
+    backend = name
+    return backend
+
+
+def enabled():
+    """returns True if the vectorized engine uses the compiled kernels"""
+    return backend == 'numba'
+
+
+def floattype(*values):
+    """returns floating point type of the results of values: float32 if all NumPy arrays among values are float32
+    (single precision time series of the vectorized engine; Python numbers do not count), otherwise float64"""
+    dtypes = [x.dtype for x in values if isinstance(x, (np.ndarray, np.generic))]
+    return np.dtype(np.float32) if dtypes and all(dtype == np.float32 for dtype in dtypes) else np.dtype(np.float64)
+
+
+def arrays(*values):
+    """returns values broadcast against each other as contiguous two-dimensional float arrays (of floattype)"""
+    dtype = floattype(*values)
+    return [np.array(x, dtype=dtype, order='C') for x in np.broadcast_arrays(*[np.atleast_2d(np.asarray(x, dtype=dtype)) for x in values])]
+
+
+def erf(x):
+    x = np.asarray(x, dtype=floattype(x))
+    result = np.empty(x.size, dtype=x.dtype)
+    compiled['erf'](np.ascontiguousarray(x).ravel(), result)
+    return result.reshape(x.shape)
+
+
+def plantcorrelation(coefficients, TenteringPP, Tenv):
+    TenteringPP, Tenv = arrays(TenteringPP, Tenv)
+    result = np.empty(TenteringPP.shape, dtype=TenteringPP.dtype)
+    compiled['plantcorrelation'](np.array(coefficients, dtype=float), TenteringPP, Tenv, result)
+    return result
+
+
+def annualenergy(power, plantlifetime, timestepsperyear, utilfactor):
+    #single precision power is integrated without conversion, the sums accumulate in float64
+    power = np.atleast_2d(power)
+    power = np.ascontiguousarray(power, dtype=floattype(power))
+    result = np.empty((power.shape[0], plantlifetime))
+    compiled['annualenergy'](power, timestepsperyear, 1./timestepsperyear*365.*24., result)
+    return result*1000.*utilfactor
+
+
+def wellboretemperature(thermalprofile, depth, Tfluid, rameyA):
+    Tfluid, rameyA, depth = arrays(Tfluid, rameyA, depth)
+    n = Tfluid.shape[0]
+    topdepth, toptemperature, gradient = [np.ascontiguousarray(np.broadcast_to(x, (n, thermalprofile.layers)), dtype=float)
+                                          for x in [thermalprofile.topdepth, thermalprofile.toptemperature, thermalprofile.gradient]]
+    result = np.empty(Tfluid.shape, dtype=Tfluid.dtype)
+    compiled['wellboretemperature'](topdepth, toptemperature, gradient, np.ascontiguousarray(depth[:, 0:1]), Tfluid, rameyA, result)
+    return result
+
+
+setbackend(os.environ.get('GEOPHIRES_BACKEND', 'numpy'))
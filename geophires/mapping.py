@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Gridded regional resource mapping with GEOPHIRES v2.0
+
+Runs a GEOPHIRES base case for every cell of a grid with cell values of the
+geothermal gradients, layer thicknesses and surface temperature taken from
+2-D rasters (NumPy .npy files, memory-mapped). Cells are processed tile by
+tile with the vectorized engine (geophires.vectorized): maximum depth, initial
+reservoir temperature, reservoir response and Price of all valid cells of a
+tile are calculated at once, and the output rasters (.npy, memory-mapped) are
+written tile by tile, so grids larger than the available memory can be mapped.
+
+With --float32 the time series of the vectorized engine are stored and
+computed in single precision (annual energy and economic sums stay in float64),
+which halves the memory and memory bandwidth per cell. The deviation of Price
+from double precision is then checked on a random sample of valid cells before
+the map is calculated and reported (with a warning above --tolerance).
+
+Raster values are in input file units (Gradient in deg.C/km, Thickness in km,
+Surface Temperature in deg.C). Cells outside the mask, with non-finite raster
+values or with values outside the valid input range are nodata (NaN) in the
+output rasters. All other parameters are taken from the base case input file.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.mapping base.txt --raster "Gradient 1=gradient.npy"
+        --raster "Surface Temperature=tsurf.npy" --mask land.npy --output maps [--float32]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import vectorized
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#raster parameters: input file parameter name -> (variable, layer index, conversion factor to GEOPHIRES units,
+#valid range in input file units). Gradient k and Thickness k are available for any layer k (see rasterparameter).
+rasterparameters = {
+    'Gradient 1': ('gradient', 0, 1/1000, (0., 500.)),
+    'Thickness 1': ('layerthickness', 0, 1000., (0.01, 100.)),
+    'Surface Temperature': ('Tsurf', None, 1., (-50., 50.))}
+
+#output rasters: name -> function of the simulation result returning one value per scenario
+outputrasters = {
+    'Price': lambda result: result.Price,
+    'maxdepth': lambda result: result.maxdepth,
+    'depth': lambda result: result.depth,
+    'Trock': lambda result: result.Trock,
+    'averageproducedtemperature': lambda result: np.average(result.ProducedTemperature, axis=1)}
+
+
+def rasterparameter(name):
+    """returns (variable, layer index, conversion factor, valid range) of raster parameter name or None if name
+    cannot be provided as raster"""
+    if name in rasterparameters:
+        return rasterparameters[name]
+    prefix, _, layer = name.rpartition(' ')
+    if prefix in ['Gradient', 'Thickness'] and layer.isdigit() and int(layer) >= 1:
+        variable, _, factor, validrange = rasterparameters[prefix+' 1']
+        return variable, int(layer)-1, factor, validrange
+    return None
+
+
+def tiles(shape, tilesize):
+    """yields (row slice, column slice) of all tiles of a grid"""
+    for row in range(0, shape[0], tilesize):
+        for col in range(0, shape[1], tilesize):
+            yield slice(row, min(row+tilesize, shape[0])), slice(col, min(col+tilesize, shape[1]))
+
+
+def celloverrides(parameters, values):
+    """returns per-scenario parameter overrides for the vectorized engine from raster values (input file units)
+
+    raises ValueError for a raster of a layer the base case does not use (Gradient k beyond Number of Segments,
+    Thickness k of the deepest or a deeper segment)"""
+    overrides = {}
+    for name, cellvalues in values.items():
+        variable, layer, factor, validrange = rasterparameter(name)
+        cellvalues = cellvalues*factor
+        if variable == 'gradient':
+            # convert 0 C/m gradients to very small number (as when reading the input file)
+            cellvalues = np.where(cellvalues == 0, 1e-6, cellvalues)
+        if layer is None:
+            overrides[variable] = cellvalues
+        else:
+            layers = overrides.get(variable, list(parameters[variable]))
+            #only the first numseg layers are used, the deepest of them has infinite (100 km) thickness
+            usedlayers = parameters['numseg']-1 if variable == 'layerthickness' else parameters['numseg']
+            if layer >= usedlayers:
+                raise ValueError("raster '%s' is not used by the base case with Number of Segments %d (rasters for "
+                                 "Gradient 1 to %d and Thickness 1 to %d possible)"
+                                 % (name, parameters['numseg'], parameters['numseg'], parameters['numseg']-1)
+                                 if parameters['numseg'] > 1 else
+                                 "raster '%s' is not used by the base case with Number of Segments 1 (rasters for "
+                                 "Gradient 1 possible)" % name)
+            layers[layer] = cellvalues
+            overrides[variable] = layers
+    return overrides
+
+
+def validcells(values, mask=None):
+    """returns boolean array of the cells with finite raster values in the valid range (and nonzero mask)"""
+    valid = np.ones(values[next(iter(values))].shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    for name, cellvalues in values.items():
+        low, high = rasterparameter(name)[3]
+        valid = valid & np.isfinite(cellvalues) & (cellvalues >= low) & (cellvalues <= high)
+    return valid
+
+
+def precisioncheck(parameters, rasters, mask=None, samples=200, seed=0, dtype=np.float32):
+    """compares Price in dtype with float64 on a random sample of valid cells (see vectorized.precisioncheck),
+    returns dictionary with number of compared cells, maximum relative deviation of Price and the worst cell"""
+    shape = np.shape(next(iter(rasters.values())))
+    rng = np.random.default_rng(seed)
+    #candidate cells are drawn over the whole grid, the valid ones among them are checked
+    cells = rng.choice(shape[0]*shape[1], min(10*samples, shape[0]*shape[1]), replace=False)
+    rows, cols = np.unravel_index(np.sort(cells), shape)
+    values = {name: np.asarray(raster[rows, cols], dtype=float) for name, raster in rasters.items()}
+    index = np.flatnonzero(validcells(values, None if mask is None else mask[rows, cols]))[:samples]
+    if len(index) == 0:
+        return {'samples': 0, 'maxdeviation': 0., 'cell': None}
+    overrides = celloverrides(parameters, {name: cellvalues[index] for name, cellvalues in values.items()})
+    check = vectorized.precisioncheck(parameters, overrides, samples=len(index), seed=seed, dtype=dtype)
+    if check['scenario'] < 0:
+        return {'samples': 0, 'maxdeviation': 0., 'cell': None}
+    worst = index[check['scenario']]
+    return {'samples': check['samples'], 'maxdeviation': check['maxdeviation'], 'cell': (int(rows[worst]), int(cols[worst]))}
+
+
+def runmap(fname, rasters, outputdir, mask=None, tilesize=256, chunksize=2048, outputs=None, progress=None,
+           dtype=np.float64):
+    """maps base case input file fname over the rasters and writes output rasters <outputdir>/<output>.npy
+
+    rasters: dictionary input parameter name (see rasterparameter) -> 2-D array (e.g. memory-mapped .npy)
+    mask: 2-D boolean array, cells that are False are not calculated
+    chunksize: maximum number of cells per call of the vectorized engine
+    dtype: precision of the time series of the vectorized engine (np.float64 or np.float32)
+    returns dictionary with number of cells, number of calculated cells and wall time"""
+    tic = time.perf_counter()
+    for name in rasters:
+        if rasterparameter(name) is None:
+            raise ValueError("'%s' cannot be provided as raster (available: Gradient k, Thickness k, Surface Temperature)" % name)
+    shape = np.shape(next(iter(rasters.values())))
+    for name, raster in list(rasters.items()) + [('mask', mask if mask is not None else np.ones(shape))]:
+        if np.shape(raster) != shape:
+            raise ValueError("raster '%s' has shape %s, expected %s" % (name, np.shape(raster), shape))
+    outputs = outputs or list(outputrasters)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        parameters = GEOPHIRESv2.readinput(GEOPHIRESv2.readinputfile(fname))
+    #rasters of layers the base case does not use are rejected before any output is written
+    celloverrides(parameters, {name: np.ones(1) for name in rasters})
+    os.makedirs(outputdir, exist_ok=True)
+    outputfiles = {}
+    for output in outputs:
+        outputfiles[output] = np.lib.format.open_memmap(os.path.join(outputdir, output+'.npy'), mode='w+', dtype=np.float64, shape=shape)
+
+    cells = 0
+    for rows, cols in tiles(shape, tilesize):
+        values = {name: np.asarray(raster[rows, cols], dtype=float) for name, raster in rasters.items()}
+        valid = validcells(values, None if mask is None else mask[rows, cols])
+        index = np.flatnonzero(valid)
+        tileoutputs = {output: np.full(valid.size, np.nan) for output in outputs}
+        for start in range(0, len(index), chunksize):
+            chunk = index[start:start+chunksize]
+            overrides = celloverrides(parameters, {name: tilevalues.ravel()[chunk] for name, tilevalues in values.items()})
+            with np.errstate(all='ignore'):
+                result = vectorized.simulate(parameters, overrides, dtype)
+            for output in outputs:
+                tileoutputs[output][chunk] = outputrasters[output](result)
+        for output in outputs:
+            outputfiles[output][rows, cols] = tileoutputs[output].reshape(valid.shape)
+            outputfiles[output].flush()
+        cells = cells + len(index)
+        if progress is not None:
+            progress(rows, cols, len(index))
+    return {'cells': shape[0]*shape[1], 'calculated': cells, 'walltime': time.perf_counter()-tic}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.mapping', description='GEOPHIRES v2.0 gridded resource mapping')
+    parser.add_argument('inputfile', help='GEOPHIRES base case input file')
+    parser.add_argument('--raster', action='append', default=[], metavar='PARAMETER=FILE',
+                        help='raster (.npy) with cell values of input parameter (Gradient k, Thickness k of layer k, Surface Temperature)')
+    parser.add_argument('--mask', help='raster (.npy) of cells to calculate (nonzero) or skip (zero)')
+    parser.add_argument('--output', default='maps', help='folder for output rasters (default: maps)')
+    parser.add_argument('--outputs', default=','.join(outputrasters),
+                        help='comma-separated output rasters (default: %s)' % ','.join(outputrasters))
+    parser.add_argument('--tile', type=int, default=256, help='tile size in cells (default: 256)')
+    parser.add_argument('--float32', action='store_true',
+                        help='store and compute time series in single precision (Price checked against float64 on a sample of cells)')
+    parser.add_argument('--samples', type=int, default=200, help='number of cells of the --float32 check (default: 200)')
+    parser.add_argument('--tolerance', type=float, default=1E-4,
+                        help='maximum relative deviation of Price in the --float32 check before a warning (default: 1E-4)')
+    args = parser.parse_args(argv)
+
+    rasters = {}
+    for raster in args.raster:
+        name, _, rasterfname = raster.partition('=')
+        if rasterparameter(name.strip()) is None or not rasterfname:
+            parser.error("invalid raster '%s'" % raster)
+        rasters[name.strip()] = np.load(os.path.abspath(rasterfname.strip()), mmap_mode='r')
+    if not rasters:
+        parser.error('at least one raster is required')
+    mask = np.load(os.path.abspath(args.mask), mmap_mode='r') if args.mask else None
+    outputs = [output.strip() for output in args.outputs.split(',')]
+    for output in outputs:
+        if output not in outputrasters:
+            parser.error("unknown output raster '%s'" % output)
+    fname = os.path.abspath(args.inputfile)
+    outputdir = os.path.abspath(args.output)
+
+    #file names in the input file are relative to the GEOPHIRES folder
+    os.chdir(rootdir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        parameters = GEOPHIRESv2.readinput(GEOPHIRESv2.readinputfile(fname))
+    try:
+        celloverrides(parameters, {name: np.ones(1) for name in rasters})
+    except ValueError as e:
+        parser.error(str(e))
+    shape = np.shape(next(iter(rasters.values())))
+    print('GEOPHIRES map %d x %d cells, tiles of %d x %d cells' % (shape[0], shape[1], args.tile, args.tile))
+    dtype = np.float32 if args.float32 else np.float64
+    if args.float32:
+        check = precisioncheck(parameters, rasters, mask, args.samples)
+        print('float32 check: maximum relative deviation of Price from float64 %.2e on %d cells' % (check['maxdeviation'], check['samples'])
+              + (' (cell %d, %d)' % check['cell'] if check['cell'] is not None else ''))
+        if check['maxdeviation'] > args.tolerance:
+            print('Warning: the deviation exceeds the tolerance %g. Consider mapping in float64 (without --float32)' % args.tolerance)
+    summary = runmap(fname, rasters, outputdir, mask, args.tile, outputs=outputs, dtype=dtype)
+    print('%(calculated)d of %(cells)d cells calculated in %(walltime).1f s' % summary + '. Output rasters written to ' + outputdir)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-objective Pareto search with GEOPHIRES v2.0
+
+Searches the trade-off between levelized cost of electricity (Price), capacity
+(average net electricity production) and capital cost (Ccap) with a genetic
+algorithm in the style of NSGA-II (non-dominated sorting, crowding distance,
+simulated binary crossover and polynomial mutation) with a fixed random seed.
+The design variables are the numbers of production and injection wells, the
+flow rate per production well, the reservoir depth, the power plant type and
+the end-use option; all other parameters are taken from the base case input
+file (text, JSON or TOML), which the design parameters override as typed
+values (GEOPHIRESv2.InputValues). Every generation is evaluated with the batch
+engine (geophires.batch, with design constraint screening) in parallel worker
+processes. Designs are
+cached (optionally in a JSON file): a design seen before, in this run or in an
+earlier run with the same base case, is never simulated again. Screened or
+failed designs are infeasible and ranked behind all feasible designs.
+
+The result is the non-dominated set of all feasible designs evaluated during
+the search. End-use options default to those with electricity as main product
+(1, 31, 41, 51), for which Price is the levelized cost of electricity.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.pareto Examples/example1.txt --population 40 --generations 20 --output pareto.csv
+    python -m geophires.pareto base.txt --depth 2:6 --pptype 1,2 --cache designs.json --workers 4
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import batch
+
+#design variables: (name, input file parameter, kind, bounds (int, float) or choices (choice), resolution (float))
+defaultvariables = [
+    ('nprod', 'Number of Production Wells', 'int', (1, 6), None),
+    ('ninj', 'Number of Injection Wells', 'int', (1, 6), None),
+    ('prodwellflowrate', 'Production Flow Rate per Well', 'float', (20., 100.), 0.1),
+    ('depth', 'Reservoir Depth', 'float', (2., 6.), 0.01),
+    ('pptype', 'Power Plant Type', 'choice', [1, 2, 3, 4], None),
+    ('enduseoption', 'End-Use Option', 'choice', [1, 31, 41, 51], None)]
+
+#objectives: (name, batch result table column, sign to turn the objective into a minimization)
+objectives = [('price', 'price', 1.), ('capacity', 'averagenetelectricity', -1.), ('capitalcost', 'capitalcost', 1.)]
+
+
+def decode(x, variables):
+    """returns design (tuple of variable values) for genome x (one value in [0, 1] per variable)"""
+    design = []
+    for xi, (name, parameter, kind, bounds, resolution) in zip(x, variables):
+        if kind == 'int':
+            design.append(int(min(bounds[0]+np.floor(xi*(bounds[1]-bounds[0]+1)), bounds[1])))
+        elif kind == 'float':
+            design.append(round(round((bounds[0]+xi*(bounds[1]-bounds[0]))/resolution)*resolution, 10))
+        else:
+            design.append(bounds[min(int(xi*len(bounds)), len(bounds)-1)])
+    return tuple(design)
+
+
+def deck(design, variables, basecontent):
+    """returns GEOPHIRESv2.InputValues of design: the base case content (input file lines or parameter mapping) with
+    the design parameters overriding it"""
+    return GEOPHIRESv2.InputValues(basecontent, dict((variable[1], value) for variable, value in zip(variables, design)))
+
+
+def evaluate(content, screen):
+    """worker: runs design input (GEOPHIRESv2.InputValues) with the batch engine and returns the result table row"""
+    return batch.runcase('design', GEOPHIRESv2.getconstraints(screen), content=content)
+
+
+def objectivevalues(row):
+    """returns objective values to minimize of a result table row, None for infeasible designs"""
+    if row['status'] != 'ok':
+        return None
+    values = [sign*row.get(column) for name, column, sign in objectives]
+    if any(value is None or not np.isfinite(value) for value in values):
+        return None
+    return values
+
+
+def dominates(F):
+    """returns boolean matrix D with D[i, j] True if design i dominates design j (objective rows of F minimized)"""
+    lessequal = np.all(F[:, None, :] <= F[None, :, :], axis=2)
+    less = np.any(F[:, None, :] < F[None, :, :], axis=2)
+    return lessequal & less
+
+
+def nondominatedfronts(F):
+    """returns list of fronts (index arrays) of the objective rows of F, best front first"""
+    D = dominates(F)
+    dominatedby = np.sum(D, axis=0)
+    remaining = np.ones(len(F), dtype=bool)
+    fronts = []
+    while np.any(remaining):
+        front = np.flatnonzero(remaining & (dominatedby == 0))
+        fronts.append(front)
+        remaining[front] = False
+        dominatedby = dominatedby - np.sum(D[front], axis=0)
+    return fronts
+
+
+def crowdingdistance(F):
+    """returns crowding distance of the objective rows of F (one front), infinite at the boundaries"""
+    n, m = F.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        return np.full(n, np.inf)
+    for k in range(m):
+        order = np.argsort(F[:, k], kind='stable')
+        span = F[order[-1], k]-F[order[0], k]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (F[order[2:], k]-F[order[:-2], k])/span
+    return distance
+
+
+def rank(F):
+    """returns (front rank, crowding distance) per design; infeasible designs (None) rank behind all feasible designs"""
+    n = len(F)
+    ranks = np.zeros(n, dtype=int)
+    distance = np.zeros(n)
+    feasible = [i for i in range(n) if F[i] is not None]
+    if feasible:
+        values = np.array([F[i] for i in feasible], dtype=float)
+        fronts = nondominatedfronts(values)
+        for r, front in enumerate(fronts):
+            ranks[np.array(feasible)[front]] = r
+            distance[np.array(feasible)[front]] = crowdingdistance(values[front])
+        ranks[[i for i in range(n) if F[i] is None]] = len(fronts)
+    return ranks, distance
+
+
+def tournament(ranks, distance, rng, count):
+    """binary tournament selection on (rank, crowding distance), returns count indices"""
+    a = rng.integers(len(ranks), size=count)
+    b = rng.integers(len(ranks), size=count)
+    better = (ranks[a] < ranks[b]) | ((ranks[a] == ranks[b]) & (distance[a] > distance[b]))
+    return np.where(better, a, b)
+
+
+def offspring(X, ranks, distance, rng, crossoverprob=0.9, etacrossover=15., etamutation=20.):
+    """returns offspring genomes (same number as X) by simulated binary crossover and polynomial mutation"""
+    n, d = X.shape
+    parents = X[tournament(ranks, distance, rng, n+n % 2)]
+    children = parents.copy()
+    for i in range(0, len(parents), 2):
+        if rng.random() > crossoverprob:
+            continue
+        p1, p2 = parents[i], parents[i+1]
+        u = rng.random(d)
+        beta = np.where(u <= 0.5, (2*u)**(1/(etacrossover+1)), (1/(2*(1-u)))**(1/(etacrossover+1)))
+        swap = rng.random(d) < 0.5
+        c1 = 0.5*((1+beta)*p1+(1-beta)*p2)
+        c2 = 0.5*((1-beta)*p1+(1+beta)*p2)
+        children[i] = np.where(swap, c2, c1)
+        children[i+1] = np.where(swap, c1, c2)
+    mutate = rng.random(children.shape) < 1./d
+    u = rng.random(children.shape)
+    delta = np.where(u < 0.5, (2*u)**(1/(etamutation+1))-1, 1-(2*(1-u))**(1/(etamutation+1)))
+    children = np.where(mutate, children+delta, children)
+    return np.clip(children[:n], 0., 1.)
+
+
+class DesignCache(object):
+    """result table rows of evaluated designs, optionally stored in a JSON file (only reused for the same base case)"""
+
+    def __init__(self, fname=None, basekey=''):
+        self.fname = fname
+        self.basekey = basekey
+        self.rows = {}
+        if fname is not None and os.path.exists(fname):
+            with open(fname) as f:
+                stored = json.load(f)
+            if stored.get('base') == basekey:
+                self.rows = stored['designs']
+
+    @staticmethod
+    def key(design):
+        return json.dumps(list(design))
+
+    def __contains__(self, design):
+        return self.key(design) in self.rows
+
+    def __getitem__(self, design):
+        return self.rows[self.key(design)]
+
+    def __setitem__(self, design, row):
+        self.rows[self.key(design)] = row
+
+    def save(self):
+        if self.fname is not None:
+            with open(self.fname, 'w') as f:
+                json.dump({'base': self.basekey, 'designs': self.rows}, f)
+
+
+def evaluatedesigns(designs, variables, basecontent, cache, executor, screen='all'):
+    """evaluates the designs not in the cache in parallel, returns number of simulated designs"""
+    new = []
+    for design in designs:
+        if design not in cache and design not in new:
+            new.append(design)
+    contents = [deck(design, variables, basecontent) for design in new]
+    for design, row in zip(new, executor.map(evaluate, contents, [screen]*len(new))):
+        row['case'] = ' '.join(str(value) for value in design)
+        cache[design] = row
+    return len(new)
+
+
+def paretosearch(basefname, variables=None, population=40, generations=20, seed=0, workers=None, screen='all',
+                 cachefname=None, progress=None):
+    """runs the Pareto search and returns (non-dominated designs as list of (design, result table row), statistics)
+
+    progress: function called with (generation, number of simulated designs, number of cached designs) after
+    every generation"""
+    variables = variables or defaultvariables
+    basecontent = GEOPHIRESv2.readinputfile(basefname)
+    basekey = hashlib.sha256(json.dumps([basecontent, [v[:2] for v in variables], screen]).encode('UTF-8')).hexdigest()
+    cache = DesignCache(cachefname, basekey)
+    rng = np.random.default_rng(seed)
+    statistics = {'simulated': 0, 'cached': 0, 'designs': 0}
+    X = rng.random((population, len(variables)))
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        for generation in range(generations+1):
+            if generation > 0:
+                ranks, distance = rank([objectivevalues(cache[design]) for design in designs])
+                X = np.vstack([X, offspring(X, ranks, distance, rng)])
+            designs = [decode(x, variables) for x in X]
+            simulated = evaluatedesigns(designs, variables, basecontent, cache, executor, screen)
+            cached = len(designs)-simulated
+            statistics['simulated'] += simulated
+            statistics['cached'] += cached
+            cache.save()
+            #environmental selection: best fronts of parents and offspring, filled up by crowding distance
+            ranks, distance = rank([objectivevalues(cache[design]) for design in designs])
+            order = np.lexsort((-distance, ranks))[:population]
+            X = X[order]
+            designs = [designs[i] for i in order]
+            if progress is not None:
+                progress(generation, simulated, cached)
+    #non-dominated set of all feasible designs evaluated (with the base case) during the search
+    evaluated = [(tuple(json.loads(key)), row) for key, row in cache.rows.items()]
+    feasible = [(design, row) for design, row in evaluated if objectivevalues(row) is not None]
+    statistics['designs'] = len(evaluated)
+    if not feasible:
+        return [], statistics
+    front = nondominatedfronts(np.array([objectivevalues(row) for design, row in feasible]))[0]
+    pareto = sorted([feasible[i] for i in front], key=lambda item: item[1]['price'])
+    return pareto, statistics
+
+
+def parsevariables(args):
+    """returns design variables with the bounds and choices given on the command line"""
+    variables = []
+    for name, parameter, kind, bounds, resolution in defaultvariables:
+        value = getattr(args, name)
+        if value is not None:
+            if kind == 'choice':
+                bounds = [int(x) for x in value.split(',')]
+            else:
+                low, high = value.split(':')
+                bounds = (int(low), int(high)) if kind == 'int' else (float(low), float(high))
+                if bounds[1] < bounds[0]:
+                    raise ValueError('empty range %s for %s' % (value, name))
+        variables.append((name, parameter, kind, bounds, resolution))
+    return variables
+
+
+def writepareto(pareto, variables, fname):
+    """writes non-dominated designs (design variables and objectives) to CSV file"""
+    with open(fname, 'w', newline='', encoding='UTF-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([variable[0] for variable in variables] + ['price', 'averagenetelectricity', 'capitalcost'])
+        for design, row in pareto:
+            writer.writerow(list(design) + [row['price'], row['averagenetelectricity'], row['capitalcost']])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.pareto',
+                                     description='GEOPHIRES v2.0 Pareto search (Price, capacity, capital cost)')
+    parser.add_argument('inputfile', help='base case input file')
+    parser.add_argument('--population', type=int, default=40, help='population size (default: 40)')
+    parser.add_argument('--generations', type=int, default=20, help='number of generations (default: 20)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('--workers', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--screen', default='all', help="design constraints to screen (default: 'all')")
+    parser.add_argument('--cache', metavar='FILE', help='JSON file with the results of evaluated designs (read and updated)')
+    parser.add_argument('--output', default='pareto.csv', help='non-dominated designs (CSV, default: pareto.csv)')
+    for name, parameter, kind, bounds, resolution in defaultvariables:
+        if kind == 'choice':
+            parser.add_argument('--'+name, help='%s values (default: %s)' % (parameter, ','.join(str(x) for x in bounds)))
+        else:
+            parser.add_argument('--'+name, help='%s range low:high (default: %s:%s)' % (parameter, bounds[0], bounds[1]))
+    args = parser.parse_args(argv)
+    try:
+        variables = parsevariables(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    def progress(generation, simulated, cached):
+        print('  generation {0:3d}   {1:4d} simulated   {2:4d} cached'.format(generation, simulated, cached))
+
+    print('GEOPHIRES Pareto search (population %d, %d generations, seed %d)' % (args.population, args.generations, args.seed))
+    tic = time.perf_counter()
+    pareto, statistics = paretosearch(args.inputfile, variables, args.population, args.generations, args.seed,
+                                      args.workers, args.screen, args.cache, progress)
+    writepareto(pareto, variables, args.output)
+    print('%d designs evaluated (%d simulated, %d cache hits) in %.1f s, %d non-dominated designs written to %s'
+          % (statistics['designs'], statistics['simulated'], statistics['cached'], time.perf_counter()-tic,
+             len(pareto), args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Local GEOPHIRES v2.0 simulation server
+
+Long-running HTTP/JSON server with a pool of warm worker processes (GEOPHIRES,
+NumPy and mpmath imported once per worker), so clients such as dashboards do
+not pay interpreter start-up and imports for every simulation. Every request
+runs in memory with its own output file (no shared HDR.out). Identical
+requests that arrive while the same simulation is still running are coalesced:
+they wait for and share the result of the running simulation. A simulation
+running longer than the timeout (--timeout) is interrupted in its worker and
+answered with status 'timeout', so a hung case does not block a worker.
+Input files of requests must lie in the GEOPHIRES folder.
+
+Endpoints:
+    POST /simulate   run one parameter set, request (JSON):
+                        inputfile    input file (relative to the GEOPHIRES folder), and/or
+                        input        input file content (text)
+                        parameters   {input parameter name: value}, overrides the input file
+                                     (e.g. {"Reservoir Depth": 3.5, "Gradient 1": 55}); unknown names and
+                                     values of the wrong type are rejected (400)
+                        outputs      simulation variables to return (default: see defaultoutputs)
+                        report       true: return the case report (text of HDR.out)
+                        screen       design constraints to screen ('all' or comma-separated names)
+                     response (JSON): status ('ok', 'skipped', 'error' or 'timeout'), results, warnings,
+                     skipconstraint/skipreason, stagetimes, walltime, coalesced, (report, message)
+    GET /status      worker count, request/simulation/coalescing counters, queue length and latency
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.server --port 8642 --workers 4 [--timeout 600]
+    curl -d '{"inputfile": "Examples/example4.txt", "parameters": {"Reservoir Depth": 3}}' localhost:8642/simulate
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import hashlib
+import http.server
+import io
+import json
+import math
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#seconds a request waits for its response beyond the simulation timeout
+timeoutmargin = 30.
+
+#simulation variables returned when the request does not list outputs
+defaultoutputs = ['Price', 'Ccap', 'Coam', 'maxdepth', 'depth', 'Trock', 'redrill', 'timevector', 'ProducedTemperature',
+                  'NetElectricityProduced', 'HeatProduced', 'PumpingPower']
+
+
+def warmup():
+    """worker process initializer: imports GEOPHIRES (with NumPy and mpmath) and changes to the GEOPHIRES folder"""
+    if rootdir not in sys.path:
+        sys.path.insert(0, rootdir)
+    import GEOPHIRESv2
+    import mpmath    #imported by reservoir models 1 and 2 on first use
+    os.chdir(rootdir)
+    return os.getpid()
+
+
+def jsonvalue(value):
+    """returns simulation variable as JSON value (arrays as lists, non-finite numbers as null)"""
+    if isinstance(value, np.ndarray):
+        return [jsonvalue(x) for x in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [jsonvalue(x) for x in value]
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    return str(value)
+
+
+def inputcontent(request):
+    """returns GEOPHIRESv2.InputValues of a request: the input text and input file, overridden by the parameters
+    (read as typed values, see GEOPHIRESv2.mappingparameters)
+
+    raises ValueError for unknown parameter names, for values of the wrong type and for input files outside the
+    GEOPHIRES folder"""
+    import GEOPHIRESv2
+    parameters = request.get('parameters') or {}
+    if not isinstance(parameters, dict):
+        raise ValueError("'parameters' must be a JSON object {input parameter name: value}")
+    content = []
+    if request.get('input'):
+        content = content + [line + '\n' for line in request['input'].splitlines()]
+    if request.get('inputfile'):
+        #only files in the GEOPHIRES folder can be read
+        folder = os.path.realpath(rootdir)
+        fname = os.path.realpath(os.path.join(folder, request['inputfile']))
+        if os.path.commonpath([folder, fname]) != folder:
+            raise ValueError("'inputfile' must be a file in the GEOPHIRES folder")
+        with open(fname, encoding='UTF-8') as f:
+            content = content + f.readlines()
+    if not content and not parameters:
+        raise ValueError("request has no 'inputfile', 'input' or 'parameters'")
+    try:
+        return GEOPHIRESv2.InputValues(content, parameters)
+    except KeyError as e:
+        raise ValueError(e.args[0])
+
+
+def simulate(content, outputs=None, report=False, screen=None, timeout=None):
+    """runs one simulation in a worker process and returns the response (JSON-serializable dictionary)
+
+    timeout: maximum run time in seconds, the simulation is interrupted (SIGALRM, where available) and the
+    response has status 'timeout'"""
+    import GEOPHIRESv2
+    tic = time.perf_counter()
+    screenoutput = io.StringIO()
+    response = {}
+    #the stages catch exceptions of their calculations (e.g. the Laplace inversion), so expiry is also recorded here
+    expired = []
+    def alarm(signum, frame):
+        expired.append(True)
+        raise TimeoutError('simulation timed out after %g s' % timeout)
+    usealarm = timeout is not None and hasattr(signal, 'setitimer')
+    if usealarm:
+        previous = signal.signal(signal.SIGALRM, alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with contextlib.redirect_stdout(screenoutput):
+            GEOPHIRESv2.profiler = GEOPHIRESv2.Profiler()
+            variables = GEOPHIRESv2.readinput(content)
+            variables['tic'] = time.time()
+            variables['printoutput'] = 0
+            result = GEOPHIRESv2.runstages(variables, GEOPHIRESv2.getconstraints(screen) if screen else None)
+            if report and result.status == 'ok':
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    variables['outputfname'] = os.path.join(tmpdir, 'HDR.out')
+                    GEOPHIRESv2.runstage(GEOPHIRESv2.writeoutput, variables)
+                    with open(variables['outputfname'], encoding='UTF-8') as f:
+                        response['report'] = f.read()
+        response.update({'status': result.status, 'skipconstraint': result.skipconstraint, 'skipreason': result.skipreason,
+                         'results': dict((name, jsonvalue(variables.get(name))) for name in (outputs or defaultoutputs)),
+                         'stagetimes': result.stagetimes})
+    except SystemExit:
+        response.update({'status': 'error', 'message': 'simulation aborted'})
+    except Exception as e:
+        response.update({'status': 'error', 'message': '%s: %s' % (type(e).__name__, e)})
+    finally:
+        if usealarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    if expired:
+        response = {'status': 'timeout', 'message': 'simulation timed out after %g s' % timeout}
+    lines = screenoutput.getvalue().splitlines()
+    response['warnings'] = [line for line in lines if line.startswith('Warning')]
+    if response['status'] == 'error':
+        response['message'] = ' '.join([line for line in lines if line.startswith('Error')] + [response['message']])
+    response['walltime'] = time.perf_counter()-tic
+    return response
+
+
+class SimulationService(object):
+    """pool of warm worker processes running simulation requests, with coalescing of identical concurrent requests"""
+
+    def __init__(self, workers=None, maxqueue=1000, timeout=600.):
+        self.workers = workers or os.cpu_count() or 1
+        self.maxqueue = maxqueue
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.running = {}
+        self.latencies = collections.deque(maxlen=1000)
+        self.counters = dict.fromkeys(['requests', 'simulations', 'coalesced', 'errors', 'timeouts', 'rejected'], 0)
+        self.startpool()
+
+    def startpool(self):
+        self.pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer=warmup)
+        #start all workers now (not with the first requests)
+        for future in [self.pool.submit(os.getpid) for i in range(self.workers)]:
+            future.result()
+
+    def submit(self, request):
+        """returns (future with response, pool running it, True if coalesced with a running identical request)"""
+        content = inputcontent(request)
+        job = (content, request.get('outputs'), bool(request.get('report')), request.get('screen'), self.timeout)
+        key = hashlib.sha256(json.dumps([content.content, content.parameters]+list(job[1:])).encode('UTF-8')).hexdigest()
+        with self.lock:
+            self.counters['requests'] += 1
+            if key in self.running:
+                self.counters['coalesced'] += 1
+                return self.running[key] + (True,)
+            if len(self.running) >= self.maxqueue:
+                self.counters['rejected'] += 1
+                raise OverflowError('simulation queue full (%d requests)' % self.maxqueue)
+            try:
+                future = self.pool.submit(simulate, *job)
+            except concurrent.futures.process.BrokenProcessPool:
+                #a worker process died while no request was waiting for it
+                self.startpool()
+                future = self.pool.submit(simulate, *job)
+            pool = self.pool
+            self.counters['simulations'] += 1
+            self.running[key] = (future, pool)
+        future.add_done_callback(lambda future: self.finished(key))
+        return future, pool, False
+
+    def finished(self, key):
+        with self.lock:
+            self.running.pop(key, None)
+
+    def run(self, request):
+        """runs request and returns response"""
+        tic = time.perf_counter()
+        future, pool, coalesced = self.submit(request)
+        try:
+            #the worker interrupts the simulation after the timeout, the margin covers the queue and the response
+            response = dict(future.result(None if self.timeout is None else self.timeout+timeoutmargin))
+        except concurrent.futures.process.BrokenProcessPool:
+            #a worker process died: restart the pool for the next requests (once, by the first request noticing it)
+            with self.lock:
+                if self.pool is pool:
+                    self.startpool()
+            response = {'status': 'error', 'message': 'worker process terminated'}
+        except concurrent.futures.TimeoutError:
+            response = {'status': 'timeout', 'message': 'no response within %g s' % (self.timeout+timeoutmargin)}
+        response['coalesced'] = coalesced
+        with self.lock:
+            self.latencies.append(time.perf_counter()-tic)
+            if response['status'] == 'error':
+                self.counters['errors'] += 1
+            elif response['status'] == 'timeout':
+                self.counters['timeouts'] += 1
+        return response
+
+    def status(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            status = dict(self.counters, workers=self.workers, queued=len(self.running))
+        if latencies:
+            status['latency'] = {'p50': latencies[len(latencies)//2], 'p95': latencies[int(len(latencies)*0.95)],
+                                 'max': latencies[-1]}
+        return status
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+class RequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def respond(self, code, response):
+        body = json.dumps(response).encode('UTF-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/status':
+            self.respond(200, self.server.service.status())
+        else:
+            self.respond(404, {'status': 'error', 'message': 'unknown endpoint %s' % self.path})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/simulate':
+            self.respond(404, {'status': 'error', 'message': 'unknown endpoint %s' % self.path})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError('request must be a JSON object')
+            response = self.server.service.run(request)
+        except OverflowError as e:
+            self.respond(503, {'status': 'error', 'message': str(e)})
+        except (ValueError, OSError) as e:
+            self.respond(400, {'status': 'error', 'message': str(e)})
+        else:
+            self.respond(200, response)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            http.server.BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+def serve(host='127.0.0.1', port=8642, workers=None, maxqueue=1000, quiet=True, timeout=600.):
+    """returns HTTP server (not yet serving) with a started simulation service"""
+    server = http.server.ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.service = SimulationService(workers, maxqueue, timeout)
+    server.quiet = quiet
+    return server
+
+
+def post(url, request, timeout=None):
+    """client: sends simulation request (dictionary) to server url (e.g. http://127.0.0.1:8642) and returns response"""
+    data = json.dumps(request).encode('UTF-8')
+    httprequest = urllib.request.Request(url.rstrip('/')+'/simulate', data, {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(httprequest, timeout=timeout) as f:
+        return json.loads(f.read())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.server', description='GEOPHIRES v2.0 simulation server')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8642, help='port (default: 8642)')
+    parser.add_argument('--workers', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--max-queue', type=int, default=1000, help='maximum number of queued simulations (default: 1000)')
+    parser.add_argument('--timeout', type=float, default=600.,
+                        help='maximum run time per simulation in seconds (default: 600)')
+    parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    server = serve(args.host, args.port, args.workers, args.max_queue, not args.verbose, args.timeout)
+    print('GEOPHIRES server listening on http://%s:%d with %d warm workers' % (args.host, args.port, server.service.workers))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental what-if sessions for GEOPHIRES v2.0
+
+A Session holds the input parameters of one case and the variables computed
+by every simulation stage. When parameters change, only the stages that
+(directly or through variables calculated by earlier stages) depend on them
+are recalculated; the results of all other stages are reused. E.g. changing
+ccplantadjfactor reruns capitalcosts, oamcosts and economics only.
+
+The dependency graph is derived from the stage functions of GEOPHIRESv2.py:
+the inputs of a stage are its arguments, its outputs the variables it returns
+(every stage returns its locals) except the arguments it leaves unchanged, so
+arguments it modifies (e.g. Tinj and depth) are outputs as well. The outputs
+are taken from the last calculation of the stage; when a stage is recalculated,
+the later stages reading any of its old or new outputs are recalculated too.
+
+Every session has its own profiler (stage timings and cache hit/miss counters);
+event counters counted inside the stages (e.g. laplaceinversions) go to the
+profiler of the current simulation run (GEOPHIRESv2.profiler).
+
+Parameters are the variables read from the input file, with the names and
+units used by the simulation (e.g. depth in m, Tinj in deg.C, ccplantadjfactor).
+Parameters derived from other parameters while reading the input file are not
+updated when the parameters they are derived from change.
+
+Usage (from the GEOPHIRES folder):
+    from geophires.session import Session
+    session = Session('Examples/example1.txt')
+    session['Price']
+    session.update(ccplantadjfactor=1.2)     # reruns capitalcosts, oamcosts, economics
+    session['Price'], session.recalculated
+"""
+
+import inspect
+import io
+import contextlib
+
+import numpy as np
+
+import GEOPHIRESv2
+
+
+def stageinputs(stage):
+    """returns names of the variables a stage reads (its arguments)"""
+    return list(inspect.signature(stage).parameters)
+
+
+def dependencygraph(stages=None, outputs=None):
+    """returns dependency graph of the simulation stages as dictionary stage name -> {'inputs', 'outputs', 'upstream'}
+
+    outputs: dictionary stage name -> names of the variables the stage calculated (e.g. Session.outputs), stages
+    not in outputs have no known outputs yet. upstream lists the earlier stages that calculate at least one of the
+    inputs of the stage"""
+    if stages is None:
+        stages = GEOPHIRESv2.stages
+    outputs = outputs or {}
+    graph = {}
+    for i, stage in enumerate(stages):
+        inputs = stageinputs(stage)
+        upstream = [previous.__name__ for previous in stages[:i]
+                    if set(graph[previous.__name__]['outputs']) & set(inputs)]
+        graph[stage.__name__] = {'inputs': inputs, 'outputs': sorted(outputs.get(stage.__name__, [])),
+                                 'upstream': upstream}
+    return graph
+
+
+def downstream(names, graph=None):
+    """returns names of the stages (in order of execution) that have to be recalculated when variables change"""
+    if graph is None:
+        graph = dependencygraph()
+    names = set(names)
+    stale = []
+    for stage, node in graph.items():
+        if names & set(node['inputs']) or set(node['upstream']) & set(stale):
+            stale.append(stage)
+    return stale
+
+
+def unchanged(old, new):
+    try:
+        return np.shape(old) == np.shape(new) and bool(np.all(old == new))
+    except Exception:
+        return False
+
+
+class Session(object):
+    """parameter set of one GEOPHIRES case with the outputs of every simulation stage
+
+    session[name] returns a simulation variable (calculating stale stages first), session.update(name=value, ...)
+    changes parameters and recalculates the stages depending on them. recalculated lists the stages calculated by
+    the last calculation, profile holds its stage timings and cache hit/miss counters."""
+
+    def __init__(self, fname=None, parameters=None, quiet=True):
+        self.quiet = quiet
+        self.parameters = {}
+        if fname is not None:
+            with self.output():
+                self.parameters = GEOPHIRESv2.readinput(GEOPHIRESv2.readinputfile(fname))
+        if parameters is not None:
+            self.parameters.update(parameters)
+        self.stages = list(GEOPHIRESv2.stages)
+        self.graph = dependencygraph(self.stages)
+        #stage name -> variables calculated by the last calculation of the stage
+        self.outputs = {}
+        self.stale = set(self.graph)
+        self.recalculated = []
+        self.profile = None
+        self.variables = None
+
+    def output(self):
+        """context manager suppressing GEOPHIRES screen output (warnings) in quiet mode"""
+        if self.quiet:
+            return contextlib.redirect_stdout(io.StringIO())
+        return contextlib.nullcontext()
+
+    def update(self, **changes):
+        """changes parameters, recalculates the stages depending on them and returns list of recalculated stages"""
+        readers = set(name for node in self.graph.values() for name in node['inputs'])
+        for name in changes:
+            if name not in self.parameters and name not in readers:
+                raise KeyError("'%s' is not a GEOPHIRES parameter" % name)
+        changed = [name for name, value in changes.items()
+                   if name not in self.parameters or not unchanged(self.parameters[name], value)]
+        self.parameters.update(changes)
+        self.stale.update(downstream(changed, self.graph))
+        return self.calculate()
+
+    def calculate(self):
+        """calculates stale stages (reusing the outputs of all other stages) and returns list of recalculated stages"""
+        if not self.stale and self.variables is not None:
+            self.recalculated = []
+            return self.recalculated
+        self.profile = GEOPHIRESv2.Profiler()
+        self.recalculated = []
+        variables = dict(self.parameters)
+        with self.output():
+            for stage in self.stages:
+                name = stage.__name__
+                if name in self.stale or name not in self.outputs:
+                    stagevariables = dict(variables)
+                    GEOPHIRESv2.runstage(stage, stagevariables, self.profile)
+                    previous = self.outputs.get(name, {})
+                    self.outputs[name] = {key: value for key, value in stagevariables.items()
+                                          if key not in variables or value is not variables[key]}
+                    #later stages reading an old or new output of the stage are recalculated as well
+                    changed = set(previous) | set(self.outputs[name])
+                    self.stale.update(later for later, node in self.graph.items() if changed & set(node['inputs']))
+                    self.profile.count('cachemisses')
+                    self.recalculated.append(name)
+                else:
+                    self.profile.count('cachehits')
+                variables.update(self.outputs[name])
+        self.stale = set()
+        self.variables = variables
+        self.graph = dependencygraph(self.stages, self.outputs)
+        return self.recalculated
+
+    def __getitem__(self, name):
+        self.calculate()
+        return self.variables[name]
+
+    @property
+    def result(self):
+        """returns SimulationResult with the current variables"""
+        self.calculate()
+        return GEOPHIRESv2.SimulationResult(self.variables, self.profile)
+
+    def writeoutput(self, outputfname):
+        """writes case report of the current variables to outputfname"""
+        self.calculate()
+        variables = dict(self.variables, outputfname=outputfname)
+        with self.output():
+            GEOPHIRESv2.runstage(GEOPHIRESv2.writeoutput, variables)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Surrogate model of GEOPHIRES v2.0 results
+
+Emulates one scalar result (default: Price) of a base case as a function of a
+few continuous input parameters within a parameter box, for interactive use
+(e.g. sliders) where even the vectorized engine is too slow (reservoir models
+1 and 2). The engine (geophires.vectorized) is sampled on a Latin hypercube
+design of the box and a Gaussian process (squared exponential kernel with one
+length scale per parameter, fitted by maximum likelihood, pure NumPy) is fitted
+to the results. A prediction takes well below a millisecond and comes with its
+standard deviation. predict() falls back to the full engine for queries outside
+the box (the trusted region) or with a predicted standard deviation above the
+tolerance; emulate() returns the Gaussian process prediction only.
+
+Parameters are the variable names of GEOPHIRESv2.readinput (internal units, e.g.
+depth in m, gradient in deg.C/m); gradient1, gradient2, ... and
+layerthickness1, ... are the layers of the thermal profile. Discrete options
+(vectorized.discreteparameters) cannot be surrogate parameters.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.surrogate train Examples/example1.txt --box depth=2500:4500 --box prodwellflowrate=30:80
+        --samples 150 --output model.npz
+    python -m geophires.surrogate predict model.npz depth=3000 prodwellflowrate=55 [--tolerance 0.01]
+
+    from geophires.surrogate import Surrogate
+    model = Surrogate(parameters, {'depth': (2500., 4500.), 'prodwellflowrate': (30., 80.)})
+    model.train(150)
+    value, std, engine = model.predict({'depth': 3000., 'prodwellflowrate': 55.})
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import vectorized
+
+#log10 of the length scales (in units of the box width) tried when fitting the Gaussian process
+lengthscalegrid = np.linspace(-1.5, 1.5, 13)
+
+#log10 of the nugget (relative variance added to the kernel diagonal) tried when fitting the Gaussian process. The
+#engine is deterministic, but results with steps (e.g. the number of redrillings, plant cost brackets) are not smooth;
+#the nugget absorbs the steps as noise and keeps the kernel matrix well conditioned
+nuggetgrid = np.linspace(-8., -1., 8)
+
+
+def latinhypercube(n, d, rng):
+    """returns n points of a Latin hypercube design in the unit cube [0, 1]^d"""
+    return (np.argsort(rng.random((n, d)), axis=0)+rng.random((n, d)))/n
+
+
+def layerparameter(name):
+    """returns (gradient or layerthickness, layer index) for surrogate parameter names gradientk/layerthicknessk,
+    else (name, None)"""
+    for prefix in ['gradient', 'layerthickness']:
+        if name.startswith(prefix) and name[len(prefix):].isdigit() and int(name[len(prefix):]) >= 1:
+            return prefix, int(name[len(prefix):])-1
+    return name, None
+
+
+def engineoverrides(parameters, values):
+    """returns vectorized engine overrides for surrogate parameter values (dictionary name -> array)"""
+    overrides = {}
+    for name, value in values.items():
+        variable, layer = layerparameter(name)
+        if layer is None:
+            overrides[name] = value
+        else:
+            if variable not in overrides:
+                overrides[variable] = list(parameters[variable])
+            overrides[variable][layer] = value
+    return overrides
+
+
+def kernel(X1, X2, lengthscales):
+    """squared exponential correlation between the rows of X1 and X2"""
+    distance = np.sum(((X1[:, None, :]-X2[None, :, :])/lengthscales)**2, axis=2)
+    return np.exp(-0.5*distance)
+
+
+def loglikelihood(X, y, lengthscales, nugget):
+    """returns (profile log likelihood, Cholesky factor, alpha, signal variance) of standardized results y"""
+    n = len(y)
+    R = kernel(X, X, lengthscales)+nugget*np.eye(n)
+    try:
+        L = np.linalg.cholesky(R)
+    except np.linalg.LinAlgError:
+        return -np.inf, None, None, None
+    alpha = np.linalg.solve(L.T, np.linalg.solve(L, y))
+    variance = max(np.dot(y, alpha)/n, 1E-300)
+    return -0.5*n*np.log(variance)-np.sum(np.log(np.diag(L))), L, alpha, variance
+
+
+class Surrogate(object):
+    """Gaussian process emulator of one scalar result of a base case over a parameter box"""
+
+    def __init__(self, parameters, box, output='Price'):
+        """parameters: input parameters of the base case (as returned by GEOPHIRESv2.readinput)
+        box: dictionary parameter name -> (low, high)
+        output: emulated scalar result"""
+        for name in box:
+            variable, layer = layerparameter(name)
+            if variable in vectorized.discreteparameters:
+                raise ValueError("parameter '%s' selects a model option and cannot be a surrogate parameter" % name)
+            if variable not in parameters or (layer is not None and layer >= len(parameters[variable])):
+                raise ValueError("unknown parameter '%s'" % name)
+            if len(box[name]) != 2 or not box[name][0] < box[name][1]:
+                raise ValueError("parameter '%s' needs a range low < high" % name)
+        self.parameters = parameters
+        self.names = list(box)
+        self.low = np.array([box[name][0] for name in self.names], dtype=float)
+        self.high = np.array([box[name][1] for name in self.names], dtype=float)
+        self.output = output
+        self.X = None
+
+    def engine(self, values):
+        """runs the vectorized engine for surrogate parameter values (dictionary name -> array) and returns the result"""
+        with contextlib.redirect_stdout(io.StringIO()), np.errstate(all='ignore'):
+            result = vectorized.simulate(self.parameters, engineoverrides(self.parameters, values))
+        return np.broadcast_to(np.asarray(getattr(result, self.output), dtype=float), np.shape(values[self.names[0]]))
+
+    def train(self, samples=100, seed=0, chunk=50):
+        """samples the engine on a Latin hypercube design of the box (in chunks of scenarios) and fits the Gaussian
+        process; returns the leave-one-out root mean square error (in units of the output)"""
+        rng = np.random.default_rng(seed)
+        X = latinhypercube(samples, len(self.names), rng)
+        points = self.low+X*(self.high-self.low)
+        y = np.concatenate([self.engine(dict(zip(self.names, points[i:i+chunk].T))) for i in range(0, samples, chunk)])
+        valid = np.isfinite(y)
+        if np.sum(valid) < 2:
+            raise ValueError('the engine returned fewer than 2 valid results in the parameter box')
+        self.fit(X[valid], y[valid])
+        return self.looerror
+
+    def fit(self, X, y):
+        """fits the Gaussian process to results y at points X (scaled to the unit cube): length scales and nugget by
+        coordinate search on the profile likelihood"""
+        self.ymean = np.average(y)
+        self.ystd = np.std(y) if np.std(y) > 0 else 1.
+        z = (y-self.ymean)/self.ystd
+        #log10 of the length scales and the nugget
+        theta = np.append(np.zeros(X.shape[1]), -6.)
+        best = loglikelihood(X, z, 10**theta[:-1], 10**theta[-1])[0]
+        for sweep in range(3):
+            improved = False
+            for k in range(len(theta)):
+                for value in (lengthscalegrid if k < X.shape[1] else nuggetgrid):
+                    trial = theta.copy()
+                    trial[k] = value
+                    likelihood = loglikelihood(X, z, 10**trial[:-1], 10**trial[-1])[0]
+                    if likelihood > best:
+                        best, theta, improved = likelihood, trial, True
+            if not improved:
+                break
+        self.X = X
+        self.lengthscales = 10**theta[:-1]
+        self.nugget = 10**theta[-1]
+        likelihood, self.L, self.alpha, self.variance = loglikelihood(X, z, self.lengthscales, self.nugget)
+        self.inverse()
+        #leave-one-out residuals of the Gaussian process: alpha_i/(R^-1)_ii
+        self.looerror = np.sqrt(np.average((self.alpha/np.diag(self.Rinv))**2))*self.ystd
+
+    def inverse(self):
+        #inverse of the correlation matrix (from its Cholesky factor) for the prediction variance
+        Linv = np.linalg.solve(self.L, np.eye(len(self.L)))
+        self.Rinv = np.dot(Linv.T, Linv)
+
+    def scaled(self, points):
+        """returns (surrogate parameter values as rows scaled to the unit cube, shape of the queries)"""
+        values = [np.asarray(points[name], dtype=float) for name in self.names]
+        shape = np.broadcast(*values).shape
+        values = np.stack([np.broadcast_to(value, shape).ravel() for value in values], axis=1)
+        return (values-self.low)/(self.high-self.low), shape
+
+    def emulate(self, points):
+        """returns Gaussian process prediction and standard deviation for points (dictionary parameter name -> value
+        or array of values)"""
+        if self.X is None:
+            raise ValueError('surrogate model is not trained')
+        X, shape = self.scaled(points)
+        r = kernel(X, self.X, self.lengthscales)
+        mean = self.ymean+self.ystd*np.dot(r, self.alpha)
+        std = self.ystd*np.sqrt(self.variance*np.maximum(1.+self.nugget-np.sum(np.dot(r, self.Rinv)*r, axis=1), 0.))
+        return mean.reshape(shape), std.reshape(shape)
+
+    def trusted(self, points):
+        """returns True for points inside the parameter box (the trusted region)"""
+        X, shape = self.scaled(points)
+        return np.all((X >= 0.) & (X <= 1.), axis=1).reshape(shape)
+
+    def predict(self, points, tolerance=0.01):
+        """returns (value, standard deviation, engine) for points (dictionary parameter name -> value or array of
+        values): the Gaussian process prediction, or the engine result (standard deviation 0, engine True) for
+        points outside the box or with a standard deviation above tolerance times the absolute prediction"""
+        mean, std = self.emulate(points)
+        engine = ~self.trusted(points) | (std > tolerance*np.abs(mean))
+        if np.any(engine):
+            values = dict((name, np.broadcast_to(np.asarray(points[name], dtype=float), mean.shape)[engine])
+                          for name in self.names)
+            mean = mean.copy()
+            std = std.copy()
+            mean[engine] = self.engine(values)
+            std[engine] = 0.
+        if mean.ndim == 0:
+            return float(mean), float(std), bool(engine)
+        return mean, std, engine
+
+    def save(self, fname, inputfile=''):
+        """writes the trained model (not the base case parameters) to a .npz file, inputfile: base case input file
+        recorded in the model file"""
+        np.savez(fname, names=np.array(self.names), low=self.low, high=self.high, output=np.array(self.output),
+                 inputfile=np.array(inputfile),
+                 X=self.X, lengthscales=self.lengthscales, alpha=self.alpha, L=self.L,
+                 stats=np.array([self.ymean, self.ystd, self.variance, self.nugget, self.looerror]))
+
+    @classmethod
+    def load(cls, fname, parameters):
+        """returns trained model read from a .npz file, parameters: input parameters of the same base case"""
+        with np.load(fname) as data:
+            names = [str(name) for name in data['names']]
+            model = cls(parameters, dict(zip(names, zip(data['low'], data['high']))), str(data['output']))
+            model.X, model.lengthscales, model.alpha, model.L = data['X'], data['lengthscales'], data['alpha'], data['L']
+            model.ymean, model.ystd, model.variance, model.nugget, model.looerror = data['stats']
+        model.inverse()
+        return model
+
+
+def readparameters(fname):
+    """returns input parameters of an input file (input warnings suppressed)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GEOPHIRESv2.readinput(GEOPHIRESv2.readinputfile(fname))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.surrogate', description='GEOPHIRES v2.0 surrogate model')
+    commands = parser.add_subparsers(dest='command', required=True)
+    train = commands.add_parser('train', help='sample the engine and fit the surrogate model')
+    train.add_argument('inputfile', help='base case input file')
+    train.add_argument('--box', action='append', required=True, metavar='NAME=LOW:HIGH',
+                       help='parameter range (internal units, e.g. depth=2500:4500), repeat for every parameter')
+    train.add_argument('--output-variable', default='Price', help='emulated result (default: Price)')
+    train.add_argument('--samples', type=int, default=100, help='number of engine samples (default: 100)')
+    train.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    train.add_argument('--output', default='surrogate.npz', help='model file (default: surrogate.npz)')
+    predict = commands.add_parser('predict', help='predict with a trained surrogate model')
+    predict.add_argument('model', help='model file')
+    predict.add_argument('values', nargs='+', metavar='NAME=VALUE', help='parameter values')
+    predict.add_argument('--input', help='base case input file for the engine fallback (default: the input file '
+                                         'the model was trained with)')
+    predict.add_argument('--tolerance', type=float, default=0.01,
+                         help='maximum relative standard deviation before the engine is used (default: 0.01)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'train':
+        try:
+            box = dict((name, tuple(float(x) for x in value.split(':'))) for name, value in
+                       (item.split('=', 1) for item in args.box))
+            model = Surrogate(readparameters(args.inputfile), box, args.output_variable)
+        except ValueError as e:
+            parser.error(str(e))
+        tic = time.perf_counter()
+        looerror = model.train(args.samples, args.seed)
+        model.save(args.output, os.path.abspath(args.inputfile))
+        print('Surrogate model of %s trained on %d samples in %.1f s (leave-one-out RMS error %.4g), written to %s'
+              % (model.output, len(model.X), time.perf_counter()-tic, looerror, args.output))
+        return 0
+
+    with np.load(args.model) as data:
+        inputfile = args.input or str(data['inputfile'])
+    values = dict((name, float(value)) for name, value in (item.split('=', 1) for item in args.values))
+    model = Surrogate.load(args.model, readparameters(inputfile))
+    missing = [name for name in model.names if name not in values]
+    if missing:
+        parser.error('missing parameter values: ' + ', '.join(missing))
+    tic = time.perf_counter()
+    value, std, engine = model.predict(values, args.tolerance)
+    print('%s = %.6g +/- %.2g (%s, %.3f ms)' % (model.output, value, std, 'engine' if engine else 'surrogate',
+                                                (time.perf_counter()-tic)*1E3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter sweeps of GEOPHIRES v2.0
+
+Expands a compact sweep specification (JSON) into scenarios on the fly and
+runs them with the batch engine (geophires.batch) without writing input files:
+every scenario is the base case input file with the swept parameters prepended
+(GEOPHIRES reads a parameter from the first line containing it), or the base
+case parameter mapping with the swept parameters replaced (JSON and TOML base
+cases). Scenarios are
+generated one at a time by nested generators, so neither the input files nor
+the full product of the axes are held in memory, and filters are applied as
+soon as the parameters they use are assigned, which prunes whole branches of
+the product.
+
+Specification:
+    {"base": "Examples/example1.txt",
+     "axes": [
+        {"product": {"Reservoir Depth": [2, 3, 4], "Gradient 1": {"range": [30, 70, 10]}}},
+        {"zip": {"Number of Production Wells": [1, 2, 3], "Number of Injection Wells": [1, 1, 2]}},
+        {"random": {"Production Flow Rate per Well": {"uniform": [30, 80]},
+                    "Power Plant Type": {"choice": [1, 2]}}, "samples": 20, "seed": 0}],
+     "filters": ["{Number of Injection Wells} <= {Number of Production Wells}",
+                 "{Reservoir Depth}*{Gradient 1} < 250"]}
+
+The axis groups are combined as a Cartesian product (in the given order, the
+last group varying fastest). Within a group, "product" combines its parameters
+as a Cartesian product, "zip" combines lists of equal length element by
+element and "random" draws "samples" scenarios (with "seed") from uniform,
+loguniform, integers (inclusive) or choice distributions. Values are lists or
+{"range": [start, stop, step]} (stop included) or {"linspace": [start, stop,
+number]}. Parameter names and values are those of the input file (any
+parameter GEOPHIRESv2.readinput reads); values of integer parameters (e.g.
+Plant Lifetime) must be integral (integers or choice for random axes). The
+base case file (text, JSON or TOML) is relative to the specification file.
+Filters are Python expressions of the swept parameters written as {Parameter
+Name}. Scenarios are named case1, case2, ... in expansion order (after
+filtering); a checkpoint (--checkpoint) resumes a scenario only if its input
+is unchanged, so a changed specification never reuses results of other
+scenarios.
+
+Usage (from the GEOPHIRES folder):
+    python -m geophires.sweep sweep.json --output results.csv [--screen all] [--timeout 600] [--checkpoint run.ckpt] [--dedup]
+    python -m geophires.sweep sweep.json --count
+"""
+
+import argparse
+import ast
+import csv
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import batch
+
+#functions available in filter expressions
+filterfunctions = {'abs': abs, 'min': min, 'max': max, 'round': round}
+
+
+def axisvalues(spec):
+    """returns list of values of an axis: list, {"range": [start, stop, step]} or {"linspace": [start, stop, number]}"""
+    if isinstance(spec, list):
+        return spec
+    if isinstance(spec, dict) and len(spec) == 1:
+        kind, arguments = list(spec.items())[0]
+        if kind == 'range':
+            start, stop, step = arguments
+            if step <= 0:
+                raise ValueError('range step must be positive')
+            return [round(start+i*step, 12) for i in range(int(np.floor((stop-start)/step*(1+1E-12)))+1)]
+        if kind == 'linspace':
+            start, stop, number = arguments
+            return [float(x) for x in np.linspace(start, stop, int(number))]
+    raise ValueError('invalid axis values %s (list, range or linspace expected)' % json.dumps(spec))
+
+
+def drawvalues(spec, rng, samples):
+    """returns samples random values of a distribution {"uniform"|"loguniform"|"integers"|"choice": arguments}"""
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValueError('invalid distribution %s' % json.dumps(spec))
+    kind, arguments = list(spec.items())[0]
+    if kind == 'uniform':
+        return [float(x) for x in rng.uniform(arguments[0], arguments[1], samples)]
+    if kind == 'loguniform':
+        return [float(x) for x in np.exp(rng.uniform(np.log(arguments[0]), np.log(arguments[1]), samples))]
+    if kind == 'integers':
+        return [int(x) for x in rng.integers(arguments[0], arguments[1]+1, samples)]
+    if kind == 'choice':
+        return [arguments[i] for i in rng.integers(len(arguments), size=samples)]
+    raise ValueError('unknown distribution %s (uniform, loguniform, integers or choice)' % kind)
+
+
+def parametervalues(name, values):
+    """returns values of a swept parameter, with integral values of integer parameters (e.g. Plant Lifetime) as int:
+    readinput does not read 20.0 as integer. Raises ValueError for other values of integer parameters"""
+    if GEOPHIRESv2.inputparametertype(name) != 'int':
+        return values
+    typed = []
+    for value in values:
+        try:
+            integral = not isinstance(value, bool) and float(value).is_integer()
+        except (TypeError, ValueError):
+            integral = False
+        if not integral:
+            raise ValueError("parameter '%s' takes integer values, not %r" % (name, value))
+        typed.append(int(value))
+    return typed
+
+
+class Group(object):
+    """axis group: iterating it yields the assignments (dictionary parameter name -> value) of the group"""
+
+    def __init__(self, spec):
+        kinds = [kind for kind in ['product', 'zip', 'random'] if kind in spec]
+        if len(kinds) != 1:
+            raise ValueError('axis group needs one of product, zip or random: %s' % json.dumps(spec))
+        self.kind = kinds[0]
+        self.spec = spec
+        self.names = list(spec[self.kind])
+        if self.kind == 'random':
+            self.samples = int(spec.get('samples', 1))
+            self.seed = spec.get('seed', 0)
+            for name in self.names:
+                parametervalues(name, drawvalues(spec['random'][name], np.random.default_rng(0), 1))
+        else:
+            self.values = [parametervalues(name, axisvalues(spec[self.kind][name])) for name in self.names]
+            if self.kind == 'zip' and len(set(len(values) for values in self.values)) > 1:
+                raise ValueError('zipped axes %s have different lengths' % ', '.join(self.names))
+
+    def __len__(self):
+        if self.kind == 'product':
+            return int(np.prod([len(values) for values in self.values]))
+        if self.kind == 'zip':
+            return len(self.values[0]) if self.values else 0
+        return self.samples
+
+    def __iter__(self):
+        if self.kind == 'product':
+            yield from self.product(0, {})
+        elif self.kind == 'zip':
+            for values in zip(*self.values):
+                yield dict(zip(self.names, values))
+        else:
+            #the same seed gives the same samples every time the group is iterated (once per scenario of the
+            #preceding groups)
+            rng = np.random.default_rng(self.seed)
+            columns = [parametervalues(name, drawvalues(self.spec['random'][name], rng, self.samples)) for name in self.names]
+            for values in zip(*columns):
+                yield dict(zip(self.names, values))
+
+    def product(self, i, assignment):
+        if i == len(self.names):
+            yield assignment
+            return
+        for value in self.values[i]:
+            yield from self.product(i+1, dict(assignment, **{self.names[i]: value}))
+
+
+class Filter(object):
+    """filter expression of swept parameters written as {Parameter Name}"""
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.names = []
+        def identifier(match):
+            if match.group(1) not in self.names:
+                self.names.append(match.group(1))
+            return 'p%d' % self.names.index(match.group(1))
+        code = re.sub(r'\{([^{}]+)\}', identifier, expression)
+        tree = ast.parse(code, mode='eval')
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Attribute, ast.Subscript, ast.Lambda, ast.NamedExpr)) or \
+                    (isinstance(node, ast.Name) and not re.fullmatch(r'p[0-9]+', node.id) and node.id not in filterfunctions):
+                raise ValueError('filter %s: only parameters {Name}, numbers, operators and %s are allowed'
+                                 % (expression, ', '.join(filterfunctions)))
+        self.code = compile(tree, '<filter>', 'eval')
+
+    def __call__(self, assignment):
+        namespace = dict(('p%d' % i, value) for i, value in enumerate(assignment[name] for name in self.names))
+        return bool(eval(self.code, {'__builtins__': {}}, dict(filterfunctions, **namespace)))
+
+
+class Sweep(object):
+    """sweep specification: base case content, axis groups and filters"""
+
+    def __init__(self, spec, folder='.'):
+        self.basefname = os.path.join(folder, spec['base'])
+        self.basecontent = GEOPHIRESv2.readinputfile(self.basefname)
+        if isinstance(self.basecontent, dict):
+            self.basecontent = GEOPHIRESv2.mappingparameters(self.basecontent)
+        self.groups = [Group(group) for group in spec.get('axes', [])]
+        self.filters = [Filter(expression) for expression in spec.get('filters', [])]
+        self.names = [name for group in self.groups for name in group.names]
+        for name in self.names:
+            if not GEOPHIRESv2.isinputparameter(name):
+                raise ValueError("unknown input parameter '%s'" % name)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError('a parameter is swept by more than one axis')
+        #filters are checked after the first group that completes their parameters
+        self.groupfilters = [[] for group in self.groups]
+        for expression in self.filters:
+            missing = [name for name in expression.names if name not in self.names]
+            if missing:
+                raise ValueError('filter %s uses parameters that are not swept: %s' % (expression.expression, ', '.join(missing)))
+            last = max([i for i, group in enumerate(self.groups) for name in expression.names if name in group.names] or [0])
+            self.groupfilters[last].append(expression)
+
+    @classmethod
+    def read(cls, fname):
+        with open(fname, encoding='UTF-8') as f:
+            return cls(json.load(f), os.path.dirname(os.path.abspath(fname)))
+
+    def size(self):
+        """returns the number of scenarios before filtering"""
+        return int(np.prod([len(group) for group in self.groups]))
+
+    def assignments(self, i=0, assignment=None):
+        """yields the scenarios (dictionary parameter name -> value) that pass all filters"""
+        assignment = assignment or {}
+        if i == len(self.groups):
+            yield assignment
+            return
+        for values in self.groups[i]:
+            scenario = dict(assignment, **values)
+            if all(expression(scenario) for expression in self.groupfilters[i]):
+                yield from self.assignments(i+1, scenario)
+
+    def deck(self, assignment):
+        """returns input file content (list of lines) of a scenario, or parameter mapping for a JSON or TOML base case"""
+        if isinstance(self.basecontent, dict):
+            return dict(self.basecontent, **assignment)
+        return ['%s,%s,\n' % (name, value) for name, value in assignment.items()] + self.basecontent
+
+    def __iter__(self):
+        """yields (case name, scenario, input file content) of all scenarios"""
+        for i, assignment in enumerate(self.assignments()):
+            yield 'case%d' % (i+1), assignment, self.deck(assignment)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m geophires.sweep', description='GEOPHIRES v2.0 parameter sweeps')
+    parser.add_argument('spec', help='sweep specification (JSON)')
+    parser.add_argument('--output', default='results.csv', help='result table (CSV, default: results.csv)')
+    parser.add_argument('--screen', default='all', help="design constraints to screen: 'all' (default), 'none' or names")
+    parser.add_argument('--timeout', type=float, help='maximum run time per case in seconds (default: no timeout)')
+    parser.add_argument('--checkpoint', metavar='FILE', help='checkpoint file (finished cases are skipped when repeated)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='run scenarios with the same canonical input parameters only once (see geophires.batch)')
+    parser.add_argument('--count', action='store_true', help='only count the scenarios that pass the filters')
+    args = parser.parse_args(argv)
+    try:
+        sweep = Sweep.read(args.spec)
+        constraints = GEOPHIRESv2.getconstraints(args.screen)
+    except (ValueError, KeyError, SyntaxError, OSError) as e:
+        parser.error('%s: %s' % (type(e).__name__, e))
+
+    if args.count:
+        count = sum(1 for assignment in sweep.assignments())
+        print('%d of %d scenarios pass the filters' % (count, sweep.size()))
+        return 0
+
+    print('GEOPHIRES sweep (%d scenarios before filtering)' % sweep.size())
+    #the scenario of every case is kept until its row is written, rows are written as the cases finish
+    scenarios = {}
+    def cases():
+        for case, assignment, content in sweep:
+            scenarios[case] = assignment
+            yield case, content
+    counts = dict.fromkeys(['ok', 'skipped', 'error', 'timeout'], 0)
+    with open(args.output, 'w', newline='', encoding='UTF-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['case']+sweep.names+batch.columns[1:], restval='')
+        writer.writeheader()
+        for row in batch.iterbatch(cases(), constraints, timeout=args.timeout, checkpoint=args.checkpoint,
+                                   dedup=args.dedup):
+            row = dict(row, **scenarios.pop(row['case']))
+            writer.writerow({key: '' if value is None else value for key, value in row.items()})
+            counts[row['status']] += 1
+            if sum(counts.values()) % 100 == 0:
+                print('  %d cases finished' % sum(counts.values()))
+    print('%(ok)d ok, %(skipped)d skipped, %(error)d errors, %(timeout)d timeouts. Result table written to ' % counts + args.output)
+    return 1 if counts['error'] or counts['timeout'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,788 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized GEOPHIRES v2.0 engine
+
+Evaluates many scenarios at once with NumPy array operations. Every stage of
+GEOPHIRESv2.py has a counterpart here with the same name, arguments and
+variables; scalar results of one scenario become arrays with one row per
+scenario (shape (n, 1)) and time series become arrays of shape (n, nt).
+Branches on continuous values (e.g. laminar or turbulent flow, plant cost
+brackets) are evaluated per scenario with np.where. Discrete options (reservoir
+model, end-use option, power plant type, economic model, ...) and the time
+grid (plantlifetime, timestepsperyear) must be the same for all scenarios.
+
+The inverse Laplace transform of reservoir models 1 and 2 uses the fixed
+Talbot method with the same contour and degree as mpmath.invertlaplace
+(method='talbot') at default precision, evaluated in complex double precision
+for all scenarios and time steps at once. TOUGH2 (reservoir model 6) is not
+supported.
+
+Values are only calculated per scenario where their inputs vary: a stage whose
+inputs are the same for all scenarios is evaluated once (one row) and
+broadcast. E.g. a sweep of maxdrawdown computes the reservoir response (and
+its Laplace inversion) once; redrilling, produced temperature, O&M costs and
+Price of all maxdrawdown values follow in one vectorized pass.
+
+The error function, Ramey's wellbore model, power plant correlations and
+annual energy integration can run as compiled kernels (geophires.kernels,
+backend numba) instead of NumPy array expressions.
+
+Time series can be stored and computed in single precision (simulate with
+dtype=np.float32), which halves the memory and memory bandwidth of the arrays
+of shape (n, nt) that dominate large maps. The stages up to the surface plant
+then run on float32 arrays (the Laplace inversion of reservoir models 1 and 2
+stays in complex double precision), per-scenario values are converted back to
+float64 before the cost models, and the annual energy integrals and the sums of
+the economic models accumulate in float64. precisioncheck reports the
+deviation of Price from double precision on a sample of scenarios.
+
+Usage:
+    import GEOPHIRESv2
+    from geophires import vectorized
+    parameters = GEOPHIRESv2.readinput(GEOPHIRESv2.readinputfile('Examples/example1.txt'))
+    result = vectorized.simulate(parameters, {'Tsurf': [10., 15., 20.]})
+    result.Price            # array with Price of every scenario
+"""
+
+import inspect
+import math
+import os
+
+import numpy as np
+
+import GEOPHIRESv2
+from geophires import kernels
+
+#parameters that select model options or the time grid (must be the same for all scenarios)
+discreteparameters = ['numseg', 'resoption', 'enduseoption', 'pptype', 'econmodel', 'wellcorrelation', 'rameyoptionprod',
+                      'impedancemodelused', 'productionwellpumping', 'usebuiltinhydrostaticpressurecorrelation',
+                      'usebuiltinppwellheadcorrelation', 'usebuiltinoutletplantcorrelation', 'plantlifetime',
+                      'timestepsperyear', 'lazyreservoir', 'ccwellfixedvalid', 'ccstimfixedvalid', 'ccgathfixedvalid',
+                      'ccplantfixedvalid', 'ccexplfixedvalid', 'totalcapcostvalid', 'oamtotalfixedvalid',
+                      'oamplantfixedvalid', 'oamwellfixedvalid', 'oamwaterfixedvalid', 'tough2modelfilename',
+                      'filenamereservoiroutput']
+
+#degree of fixed Talbot method (mpmath default at 15 digits: max(12, int(1.38*int(1.72*15))))
+talbotdegree = 34
+
+
+def column(x):
+    """returns per-scenario values as column array of shape (n, 1)"""
+    return np.asarray(x, dtype=float).reshape(-1, 1)
+
+
+def rowmax(x):
+    """returns maximum of every scenario (row) as column array"""
+    return np.max(x, axis=1, keepdims=True)
+
+
+def rowmin(x):
+    return np.min(x, axis=1, keepdims=True)
+
+
+def rowaverage(x):
+    return np.average(x, axis=1).reshape(-1, 1)
+
+
+def vaporpressurewater(Twater):
+    #Antoine equation as in GEOPHIRESv2.vaporpressurewater, with coefficients selected per element
+    A = np.where(Twater < 100, 8.07131, 8.14019)
+    B = np.where(Twater < 100, 1730.63, 1810.94)
+    C = np.where(Twater < 100, 233.426, 244.485)
+    return 133.322*(10**(A-B/(C+Twater)))/1000
+
+def erf(x):
+    if kernels.enabled():
+        return kernels.erf(x)
+    return np.frompyfunc(math.erf, 1, 1)(x).astype(float)
+
+
+def talbotinversion(fp, t, degree=talbotdegree):
+    """inverse Laplace transform of fp at times t (array of any shape) with the fixed Talbot method
+
+    fp is called with complex arrays of the shape of t and must be written with NumPy functions"""
+    r = 2./5.*degree
+    theta = np.linspace(0., np.pi, degree+1)
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        result = (np.exp(r)*fp(r/t)/2).real
+        for i in range(1, degree):
+            cottheta = 1./np.tan(theta[i])
+            delta = r*theta[i]*(cottheta + 1j)
+            result = result + (np.exp(delta)*fp(delta/t)*(1 + 1j*theta[i]*(1 + cottheta**2) - 1j*cottheta)).real
+        return 2./5.*result/t
+
+
+#simulation stage: thermal profile (maximum well depth, initial reservoir temperature and average gradient)
+def geotherm(numseg, Tmax, Tsurf, gradient, layerthickness, depth):
+    #gradient and layerthickness are lists of layers with scalar or per-scenario values, every scenario has its
+    #own thermal profile of numseg layers
+    gradient = [column(x) for x in gradient[0:numseg]]
+    layerthickness = [column(x) for x in layerthickness[0:numseg]]
+    depth = column(depth)
+    n = max([len(x) for x in gradient + layerthickness + [column(Tsurf), column(Tmax), depth]])
+    ones = np.ones((n, 1))
+    thermalprofile = GEOPHIRESv2.Geotherm((column(Tsurf)*ones).ravel(), np.hstack([x*ones for x in gradient]),
+                                          np.hstack([x*ones for x in layerthickness]))
+
+    #calculate maximum well depth (m)
+    maxdepth = thermalprofile.maxdepth((column(Tmax)*ones).ravel()).reshape(-1, 1)
+    depth = np.minimum(depth, maxdepth)
+
+    #calculate initial reservoir temperature
+    Trock = thermalprofile.temperature(depth)
+
+    #calculate average geothermal gradient
+    averagegradient = thermalprofile.averagegradient(depth)
+
+    return locals()
+
+
+#simulation stage: reservoir temperature output (reservoir models 1-5)
+def reservoir(plantlifetime, timestepsperyear, Tinj, Trock, tempgaininj, resoption, nprod, prodwellflowrate,
+              fracnumb, fracwidth, fracsep, krock, fracheight, rhorock, cprock, porrock, drawdp,
+              filenamereservoiroutput):
+    # specify time-stepping vectors
+    timevector = np.linspace(0, plantlifetime, timestepsperyear*plantlifetime+1)
+
+    # calculate reservoir water properties
+    cpwater = GEOPHIRESv2.heatcapacitywater(Tinj*0.5+(Trock*0.9+Tinj*0.1)*0.5) #J/kg/K (based on TARB in Geophires v1.2)
+    rhowater = GEOPHIRESv2.densitywater(Tinj*0.5+(Trock*0.9+Tinj*0.1)*0.5)
+
+    # temperature gain in injection wells
+    Tinj = Tinj + tempgaininj
+
+    if resoption == 1: #multiple parallel fractures model (LANL)
+        q = nprod*prodwellflowrate/rhowater # m^3/s
+        fpcoefficient = rhowater*cpwater*(q/fracnumb/fracwidth)*(fracsep/2.)/(2.*krock*fracheight)
+        fp = lambda s: (1./s)*np.exp(-np.sqrt(s)*np.tanh(fpcoefficient*np.sqrt(s)))
+        td = (rhowater*cpwater)**2/(4*krock*rhorock*cprock)*(q/fracnumb/fracwidth/fracheight)**2*timevector*365.*24.*3600
+        Twnd = talbotinversion(fp, td[:, 1:])
+        GEOPHIRESv2.profiler.count('laplaceinversions', Twnd.size)
+        Tresoutput = np.hstack([Trock, Trock - (Twnd*(Trock-Tinj))])
+
+    elif resoption == 2: #volumetric block model (1D linear heat sweep model (Stanford))
+        phi = porrock
+        h = 500. # heat transfer coefficient [W/m^2 K]
+        shape = 0.2 # ratio of conduction path length
+        alpha = krock/(rhorock*cprock)
+        gamma = (rhowater*cpwater*phi)/(rhorock*cprock*(1-phi))
+        r_efr = 0.83*(0.75*(fracsep*fracheight*fracwidth)/math.pi)**(1./3.)
+        Bi = h*r_efr/krock
+        tau_efr = r_efr**2.*(shape + 1./Bi)/(3.*alpha)
+        hl = (fracnumb-1)*fracsep
+        wl = fracwidth
+        aave = hl*wl
+        u0 = nprod*prodwellflowrate/(rhowater*aave)
+        tres = (fracheight*phi)/u0
+        ntu = tres/tau_efr
+        fp = lambda s: (1/s)*(1-np.exp(-(1+ntu/(gamma*(s+ntu)))*s))
+        Twnd = talbotinversion(fp, timevector[1:]*365.*24.*3600./tres)
+        GEOPHIRESv2.profiler.count('laplaceinversions', Twnd.size)
+        Tresoutput = np.hstack([Trock, Twnd*(Trock-Tinj) + Tinj])
+        #non-sensical temperatures (also non-finite values of the numerical inversion) are replaced by the rock temperature
+        Tresoutput = np.where(np.isfinite(Tresoutput) & (Tresoutput <= Trock) & (Tresoutput >= Tinj), Tresoutput, Trock)
+
+    elif resoption == 3: #drawdown parameter model (Tester)
+        Tresoutput = np.hstack([Trock*np.ones(np.shape(Trock*drawdp)), erf(1./drawdp/cpwater*np.sqrt(krock*rhorock*cprock/timevector[1:]/(365.*24.*3600.)))*(Trock-Tinj)+Tinj])
+
+    elif resoption == 4: #thermal drawdown percentage model (GETEM)
+        Tresoutput = (1-drawdp*timevector)*(Trock-Tinj)+Tinj
+
+    elif resoption == 5: #generic user-provided temperature profile
+        with open(filenamereservoiroutput) as f:
+            contentprodtemp = f.readlines()
+        GEOPHIRESv2.profiler.count('bytesread', os.path.getsize(filenamereservoiroutput))
+        if len(contentprodtemp) != plantlifetime*timestepsperyear+1:
+            raise ValueError('reservoir output file (%s) does not have required %d lines' % (filenamereservoiroutput, plantlifetime*timestepsperyear+1))
+        Tresoutput = np.array([float(line.split(',')[1].strip('\n')) for line in contentprodtemp])*np.ones(np.shape(Trock))
+
+    else:
+        raise ValueError('reservoir model %s not supported by the vectorized engine' % resoption)
+
+    Tresoutput = Tresoutput*np.ones((len(Trock), 1))
+
+    return locals()
+
+
+#simulation stage: production wellbore heat transmission and redrilling
+def wellbore(rameyoptionprod, tempdropprod, krock, rhorock, cprock, timevector, prodwelldiam, utilfactor,
+             prodwellflowrate, cpwater, thermalprofile, Tresoutput, depth, resoption, maxdrawdown, lazyreservoir):
+    #calculate wellbore temperature drop (the reservoir temperature output is calculated for the full plant lifetime
+    #at once, also with lazy reservoir evaluation)
+    ProdTempDrop = 0
+    if rameyoptionprod == 0:
+        ProdTempDrop = tempdropprod
+    elif rameyoptionprod == 1:
+        alpharock = krock/(rhorock*cprock)
+        #the first time step uses the Ramey function of the second time step
+        rameytime = np.append(timevector[1], timevector[1:])
+        framey = -np.log(1.1*(prodwelldiam/2.)/np.sqrt(4.*alpharock*rameytime*365.*24.*3600.*utilfactor))-0.29
+        rameyA = prodwellflowrate*cpwater*framey/2/math.pi/krock
+        #Ramey's model for every layer of the thermal profile of every scenario, on arrays of shape (n, nt, numseg)
+        if kernels.enabled():
+            ProdTempDrop = Tresoutput - kernels.wellboretemperature(thermalprofile, depth, Tresoutput, rameyA*np.ones(Tresoutput.shape))
+        else:
+            ProdTempDrop = Tresoutput - thermalprofile.wellboretemperature(depth, Tresoutput, rameyA*np.ones(Tresoutput.shape))
+
+    ProducedTemperature = Tresoutput-ProdTempDrop
+
+    #redrilling: produced temperature repeats from the first time step at which the maximum drawdown is reached
+    redrill = np.zeros((len(ProducedTemperature), 1), dtype=int)
+    if resoption < 5:
+        ProducedTemperature, redrill, indexfirstmaxdrawdown = redrilling(ProducedTemperature, maxdrawdown)
+        if lazyreservoir == 1:
+            #as with lazy reservoir evaluation in GEOPHIRESv2.py, reservoir temperature output and wellbore temperature
+            #drop repeat after redrilling as well
+            Tresoutput = redrilled(Tresoutput, indexfirstmaxdrawdown)
+            if rameyoptionprod == 1:
+                ProdTempDrop = redrilled(ProdTempDrop, indexfirstmaxdrawdown)
+
+    return locals()
+
+
+def redrilling(ProducedTemperature, maxdrawdown):
+    """returns produced temperature with redrilling, number of redrillings and index of first maximum drawdown
+
+    ProducedTemperature has shape (n, nt), maxdrawdown is scalar or per scenario"""
+    nt = ProducedTemperature.shape[1]
+    indexfirstmaxdrawdown = np.argmax(ProducedTemperature < (1-column(maxdrawdown))*ProducedTemperature[:, 0:1], axis=1).reshape(-1, 1)
+    redrill = np.where(indexfirstmaxdrawdown > 0, nt//np.maximum(indexfirstmaxdrawdown, 1), 0)
+    return redrilled(ProducedTemperature, indexfirstmaxdrawdown), redrill, indexfirstmaxdrawdown
+
+
+def redrilled(x, indexfirstmaxdrawdown):
+    """returns time series x (shape (n, nt)) repeating from the start at the first maximum drawdown of every scenario"""
+    nt = x.shape[1]
+    timeindex = np.arange(nt) % np.where(indexfirstmaxdrawdown > 0, indexfirstmaxdrawdown, nt)
+    return np.take_along_axis(x, timeindex, axis=1)
+
+
+def frictionfactor(Rewater, welldiam):
+    """returns Darcy friction factor: laminar (64/Re) for scenarios with average Reynolds number below 2300,
+    else Colebrook-White (6 iterations, as in GEOPHIRESv2.hydraulics)"""
+    relroughness = 1E-4/welldiam
+    with np.errstate(invalid='ignore', divide='ignore'):
+        f = 1./np.power(-2*np.log10(relroughness/3.7+5.74/np.power(Rewater, 0.9)), 2.)
+        for i in range(0, 5):
+            f = 1./np.power((-2*np.log10(relroughness/3.7+2.51/Rewater/np.sqrt(f))), 2.)
+    return np.where(rowaverage(np.atleast_2d(Rewater)) < 2300., 64./Rewater, f)
+
+
+#simulation stage: pressure drops and pumping power
+def hydraulics(Tresoutput, ProdTempDrop, prodwellflowrate, prodwelldiam, Tinj, ProducedTemperature, nprod,
+               ninj, waterloss, injwelldiam, impedancemodelused, depth, impedance, pumpeff,
+               usebuiltinhydrostaticpressurecorrelation, Trock, Tsurf, averagegradient, productionwellpumping,
+               usebuiltinppwellheadcorrelation, ppwellhead, PI, Phydrostatic, II,
+               usebuiltinoutletplantcorrelation, Pplantoutlet):
+    #production wellbore fluid conditions [kPa]
+    Tprodaverage = Tresoutput-ProdTempDrop/4.
+    rhowaterprod = GEOPHIRESv2.densitywater(Tprodaverage)
+    muwaterprod = GEOPHIRESv2.viscositywater(Tprodaverage)
+    vprod = prodwellflowrate/rhowaterprod/(math.pi/4.*prodwelldiam**2)
+    Rewaterprod = 4.*prodwellflowrate/(muwaterprod*math.pi*prodwelldiam)
+    f3 = frictionfactor(Rewaterprod, prodwelldiam)
+
+    #injection well conditions (constant in time, only calculated per scenario)
+    Tinjaverage = Tinj
+    rhowaterinj = GEOPHIRESv2.densitywater(Tinjaverage)
+    muwaterinj = GEOPHIRESv2.viscositywater(Tinjaverage)
+    vinj = nprod/ninj*prodwellflowrate*(1.+waterloss)/rhowaterinj/(math.pi/4.*injwelldiam**2)
+    Rewaterinj = 4.*nprod/ninj*prodwellflowrate*(1.+waterloss)/(muwaterinj*math.pi*injwelldiam)
+    f1 = frictionfactor(Rewaterinj, injwelldiam)
+
+    if impedancemodelused == 1:
+        DP1 = f1*(rhowaterinj*vinj**2/2)*(depth/injwelldiam)/1E3
+        rhowaterreservoir = GEOPHIRESv2.densitywater(0.1*Tinj+0.9*Tresoutput)
+        DP2 = impedance*nprod*prodwellflowrate*1000./rhowaterreservoir
+        DP3 = f3*(rhowaterprod*vprod**2/2.)*(depth/prodwelldiam)/1E3
+        DP4 = (rhowaterprod-rhowaterinj)*depth*9.81/1E3
+        DP = DP1 + DP2 + DP3 + DP4
+        PumpingPower = np.maximum(DP*nprod*prodwellflowrate*(1+waterloss)/rhowaterinj/pumpeff/1E3, 0.)
+
+    else: #PI and II are used
+        if usebuiltinhydrostaticpressurecorrelation == 1:
+            CP = 4.64E-7
+            CT = 9E-4/(30.796*Trock**(-0.552))
+            Phydrostatic = 0+1./CP*(np.exp(GEOPHIRESv2.densitywater(Tsurf)*9.81*CP/1000*(depth-CT/2*averagegradient*depth**2))-1)
+
+        if productionwellpumping == 1:
+            Pexcess = 344.7 #[kPa] = 50 psi
+            Pminimum = vaporpressurewater(Trock) + Pexcess
+            if usebuiltinppwellheadcorrelation == 1:
+                Pprodwellhead = Pminimum
+            else:
+                Pprodwellhead = np.maximum(ppwellhead, Pminimum)
+
+            PIkPa = PI/100
+            pumpdepth = depth + (Pminimum - Phydrostatic + prodwellflowrate/PIkPa)/(f3*(rhowaterprod*vprod**2/2.)*(1/prodwelldiam)/1E3 + rhowaterprod*9.81/1E3)
+            pumpdepthfinal = np.maximum(rowmax(pumpdepth), 0)
+
+            DP3 = Pprodwellhead - (Phydrostatic - prodwellflowrate/PIkPa - rhowaterprod*9.81*depth/1E3 - f3*(rhowaterprod*vprod**2/2.)*(depth/prodwelldiam)/1E3)
+            PumpingPowerProd = np.maximum(DP3*nprod*prodwellflowrate/rhowaterprod/pumpeff/1E3, 0.)
+
+        IIkPa = II/100
+        Pinjwellhead = Phydrostatic + prodwellflowrate*(1+waterloss)*nprod/ninj/IIkPa - rhowaterinj*9.81*depth/1E3 + f1*(rhowaterinj*vinj**2/2)*(depth/injwelldiam)/1E3
+
+        if usebuiltinoutletplantcorrelation == 1:
+            DPSurfaceplant = 68.95 #[kPa] assumes 10 psi pressure drop in surface equipment
+            Pplantoutlet = Pprodwellhead - DPSurfaceplant
+
+        DP1 = Pinjwellhead-Pplantoutlet
+        PumpingPowerInj = np.maximum(DP1*nprod*prodwellflowrate*(1+waterloss)/rhowaterinj/pumpeff/1E3, 0.)
+
+        if productionwellpumping == 1:
+            PumpingPower = PumpingPowerInj + PumpingPowerProd
+        else:
+            PumpingPower = PumpingPowerInj
+        PumpingPower = np.maximum(PumpingPower, 0.)
+
+    return locals()
+
+
+#power plant correlations of GEOPHIRESv2.surfaceplant: for every power plant type, the coefficients (C2, C1, C0)
+#and (D2, D1, D0) of the lower and upper bound of the utilization efficiency and reinjection temperature,
+#for ambient temperatures below 15 deg.C (first entry, interpolated from 5 deg.C) and above (second entry, from 15 deg.C)
+etaucoefficients = {
+    1: [((0., 2.746E-3, -8.3806E-2), (0., 2.713E-3, -9.1841E-2)), ((0., 2.713E-3, -9.1841E-2), (0., 2.676E-3, -1.012E-1))],
+    2: [((-1.55E-5, 7.604E-3, -3.78E-1), (-1.499E-5, 7.4268E-3, -3.7915E-1)), ((-1.499E-5, 7.4268E-3, -3.7915E-1), (-1.55E-5, 7.55136E-3, -4.041E-1))],
+    3: [((-4.27318E-7, 8.65629E-4, 1.78931E-1), (-5.85412E-7, 9.68352E-4, 1.58056E-1)), ((-5.85412E-7, 9.68352E-4, 1.58056E-1), (-7.78996E-7, 1.09230E-3, 1.33708E-1))],
+    4: [((-1.200E-6, 1.22731E-3, 2.26956E-1), (-1.42165E-6, 1.37050E-3, 1.99847E-1)), ((-1.42165E-6, 1.37050E-3, 1.99847E-1), (-1.66771E-6, 1.53079E-3, 1.69439E-1))]}
+reinjcoefficients = {
+    1: [((0., 0.0894, 55.6), (0., 0.0894, 62.6)), ((0., 0.0894, 62.6), (0., 0.0894, 69.6))],
+    2: [((0., 0.02, 49.26), (0., 0.02, 56.26)), ((0., 0.02, 56.26), (0., 0.02, 63.26))],
+    3: [((-1.11519E-3, 7.79126E-1, -10.2242), (-1.10232E-3, 7.83893E-1, -5.17039)), ((-1.10232E-3, 7.83893E-1, -5.17039), (-1.08914E-3, 7.88562E-1, -1.89707E-1))],
+    4: [((-7.70928E-4, 5.02466E-1, 5.22091), (-7.69455E-4, 5.09406E-1, 11.6859)), ((-7.69455E-4, 5.09406E-1, 11.6859), (-7.67751E-4, 5.16356E-1, 18.0798))]}
+
+
+def plantcorrelation(coefficients, TenteringPP, Tenv):
+    """evaluates power plant correlation (interpolated between lower and upper bound in ambient temperature)"""
+    if kernels.enabled():
+        return kernels.plantcorrelation(coefficients, TenteringPP, Tenv)
+    below15 = Tenv < 15.
+    C2, C1, C0 = [np.where(below15, low, high) for low, high in zip(coefficients[0][0], coefficients[1][0])]
+    D2, D1, D0 = [np.where(below15, low, high) for low, high in zip(coefficients[0][1], coefficients[1][1])]
+    Tfraction = np.where(below15, (Tenv-5.)/10., (Tenv-15.)/10.)
+    return (1.-Tfraction)*(C2*TenteringPP**2 + C1*TenteringPP + C0) + Tfraction*(D2*TenteringPP**2 + D1*TenteringPP + D0)
+
+
+#simulation stage: produced electricity/direct-use heat
+def surfaceplant(enduseoption, nprod, prodwellflowrate, cpwater, ProducedTemperature, Tinj,
+                 enduseefficiencyfactor, Tchpbottom, Tenv, pptype, chpfraction, PumpingPower):
+    if enduseoption == 2: #direct-use
+        HeatExtracted = nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+        HeatProduced = HeatExtracted*enduseefficiencyfactor
+    else:
+        if (math.floor(enduseoption/10) == 4):
+            TenteringPP = Tchpbottom*np.ones(np.shape(ProducedTemperature))
+        else:
+            TenteringPP = ProducedTemperature
+        #Availability water (copied from GEOPHIRES v1.0 Fortran Code)
+        A = 4.041650
+        B = -1.204E-2
+        C = 1.60500E-5
+        T0 = Tenv + 273.15
+        T1 = TenteringPP + 273.15
+        T2 = Tenv + 273.15
+        Availability = ((A-B*T0)*(T1-T2)+(B-C*T0)/2.0*(T1**2-T2**2)+C/3.0*(T1**3-T2**3)-A*T0*np.log(T1/T2))*2.2046/947.83    #MJ/kg
+
+        etau = plantcorrelation(etaucoefficients[pptype], TenteringPP, Tenv)
+        ReinjTemp = plantcorrelation(reinjcoefficients[pptype], TenteringPP, Tenv)
+
+        #injection temperature is lowered to the minimum reinjection temperature (not for cogeneration with split flow)
+        if math.floor(enduseoption/10) != 5:
+            Tinj = np.minimum(Tinj, rowmin(ReinjTemp))
+
+        if enduseoption == 1: #pure electricity
+            ElectricityProduced = Availability*etau*nprod*prodwellflowrate
+            HeatExtracted = nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+            HeatExtractedTowardsElectricity = HeatExtracted
+        elif (math.floor(enduseoption/10) == 3): #cogen topping cycle
+            ElectricityProduced = Availability*etau*nprod*prodwellflowrate
+            HeatExtracted = nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+            HeatProduced = enduseefficiencyfactor*nprod*prodwellflowrate*cpwater*(ReinjTemp - Tinj)/1E6
+            HeatExtractedTowardsElectricity = nprod*prodwellflowrate*cpwater*(ProducedTemperature - ReinjTemp)/1E6
+        elif (math.floor(enduseoption/10) == 4): #cogen bottoming cycle
+            ElectricityProduced = Availability*etau*nprod*prodwellflowrate
+            HeatExtracted = nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+            HeatProduced = enduseefficiencyfactor*nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tchpbottom)/1E6
+            HeatExtractedTowardsElectricity = nprod*prodwellflowrate*cpwater*(Tchpbottom - Tinj)/1E6
+        elif (math.floor(enduseoption/10) == 5): #cogen split of mass flow rate
+            ElectricityProduced = Availability*etau*nprod*prodwellflowrate*(1.-chpfraction)
+            HeatExtracted = nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+            HeatProduced = enduseefficiencyfactor*chpfraction*nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+            HeatExtractedTowardsElectricity = (1.-chpfraction)*nprod*prodwellflowrate*cpwater*(ProducedTemperature - Tinj)/1E6
+
+        NetElectricityProduced = ElectricityProduced - PumpingPower
+        FirstLawEfficiency = NetElectricityProduced/HeatExtractedTowardsElectricity
+
+    return locals()
+
+
+#flash plant cost brackets of GEOPHIRESv2.capitalcosts (upper bound of maximum electricity produced [MWe],
+#coefficients (C2, C1, C0) and (D2, D1, D0) at the lower and upper plant size PLL and PRL)
+flashcostbrackets = [
+    (10., (4.8472E-2, -35.2186, 8.4474E3), (4.0604E-2, -29.3817, 6.9911E3), 5., 10.),
+    (25., (4.0604E-2, -29.3817, 6.9911E3), (3.2773E-2, -23.5519, 5.5263E3), 10., 25.),
+    (50., (3.2773E-2, -23.5519, 5.5263E3), (3.4716E-2, -23.8139, 5.1787E3), 25., 50.),
+    (75., (3.4716E-2, -23.8139, 5.1787E3), (3.5271E-2, -24.3962, 5.1972E3), 50., 75.),
+    (np.inf, (3.5271E-2, -24.3962, 5.1972E3), (3.3908E-2, -23.4890, 5.0238E3), 75., 100.)]
+
+
+def powerplantcost(pptype, TenteringPP, ElectricityProduced):
+    """returns power plant cost correlation [M$] of every scenario"""
+    maxElectricityProduced = rowmax(ElectricityProduced)
+    MaxProducedTemperature = rowmax(TenteringPP)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if pptype in [1, 2]: #sub- and supercritical ORC
+            CCAPP1 = np.where(MaxProducedTemperature < 150.,
+                              -1.458333E-3*MaxProducedTemperature**3 + 7.6875E-1*MaxProducedTemperature**2 - 1.347917E2*MaxProducedTemperature + 1.0075E4,
+                              2231 - 2*(MaxProducedTemperature-150.))
+            factor = 1.1 if pptype == 2 else 1. #supercritical 10% more expensive than subcritical
+            Cplantcorrelation = factor*CCAPP1*np.power(maxElectricityProduced/15., -0.06)*maxElectricityProduced*1000./1E6
+        else: #single- and double-flash
+            factor = 0.8 if pptype == 3 else 1.
+            Cplantcorrelation = 0.
+            lowerbound = -np.inf
+            for upperbound, (C2, C1, C0), (D2, D1, D0), PLL, PRL in flashcostbrackets:
+                CCAPPLL = C2*MaxProducedTemperature**2 + C1*MaxProducedTemperature + C0
+                CCAPPRL = D2*MaxProducedTemperature**2 + D1*MaxProducedTemperature + D0
+                b = np.log(CCAPPRL/CCAPPLL)/math.log(PRL/PLL)
+                a = CCAPPRL/PRL**b
+                bracketcost = factor*a*np.power(maxElectricityProduced, b)*maxElectricityProduced*1000./1E6
+                inbracket = (maxElectricityProduced >= lowerbound) & (maxElectricityProduced < upperbound)
+                Cplantcorrelation = np.where(inbracket, bracketcost, Cplantcorrelation)
+                lowerbound = upperbound
+    return Cplantcorrelation
+
+
+#simulation stage: capital costs
+def capitalcosts(ccwellfixedvalid, ccwellfixed, nprod, ninj, wellcorrelation, depth, ccwelladjfactor,
+                 ccstimfixedvalid, ccstimfixed, ccstimadjfactor, ccgathfixedvalid, ccgathfixed,
+                 impedancemodelused, PumpingPower, productionwellpumping, PumpingPowerProd, pumpdepth,
+                 PumpingPowerInj, ccgathadjfactor, enduseoption, ccplantfixedvalid, ccplantfixed,
+                 ccplantadjfactor, HeatExtracted, pptype, TenteringPP, ElectricityProduced, HeatProduced,
+                 enduseefficiencyfactor, totalcapcostvalid, ccexplfixedvalid, ccexplfixed, ccexpladjfactor,
+                 pipinglength, totalcapcost):
+    ones = np.ones(np.shape(depth))
+
+    #well costs (using GeoVision drilling correlations)
+    if ccwellfixedvalid == 1:
+        C1well = ccwellfixed*ones
+        Cwell = C1well*(nprod+ninj)
+    else:
+        if wellcorrelation == 1: #vertical open-hole, small diameter
+            C1well = (0.3021*depth**2 + 584.9112*depth + 751368.)*1E-6
+        elif wellcorrelation == 2: #deviated liner, small diameter
+            C1well = (0.2898*depth**2 + 822.1507*depth + 680563.)*1E-6
+        elif wellcorrelation == 3: #vertical open-hole, large diameter
+            C1well = (0.2818*depth**2 + 1275.5213*depth + 632315.)*1E-6
+        elif wellcorrelation == 4: #deviated liner, large diameter
+            C1well = (0.2553*depth**2 + 1716.7157*depth + 500867.)*1E-6
+        C1well = ccwelladjfactor*C1well
+        Cwell = 1.05*C1well*(nprod+ninj)
+
+    #reservoir stimulation costs
+    if ccstimfixedvalid == 1:
+        Cstim = ccstimfixed*ones
+    else:
+        Cstim = 1.05*1.15*ccstimadjfactor*ninj*1.25*ones
+
+    #field gathering system costs (M$)
+    if ccgathfixedvalid == 1:
+        Cgath = ccgathfixed*ones
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if impedancemodelused == 1:
+                pumphp = rowmax(PumpingPower)*1341
+                numberofpumps = np.ceil(pumphp/2000)
+                pumphpcorrected = pumphp/numberofpumps
+                Cpumps = np.where(numberofpumps == 0, 0., numberofpumps*1.5*((1750*(pumphpcorrected)**0.7)*3*(pumphpcorrected)**(-0.11)))
+            else:
+                if productionwellpumping == 1:
+                    prodpumphp = rowmax(PumpingPowerProd)/nprod*1341
+                    Cpumpsprod = nprod*1.5*(1750*(prodpumphp)**0.7 + 5750*(prodpumphp)**0.2 + 10000 + rowmax(pumpdepth)*50*3.281)
+                else:
+                    Cpumpsprod = 0
+                injpumphp = rowmax(PumpingPowerInj)*1341
+                numberofinjpumps = np.ceil(injpumphp/2000)
+                injpumphpcorrected = injpumphp/numberofinjpumps
+                Cpumpsinj = np.where(numberofinjpumps == 0, 0., numberofinjpumps*1.5*(1750*(injpumphpcorrected)**0.7)*3*(injpumphpcorrected)**(-0.11))
+                Cpumps = Cpumpsinj + Cpumpsprod
+        Cgath = 1.15*ccgathadjfactor*1.12*((nprod+ninj)*750*500. + Cpumps)/1E6
+
+    #plant costs
+    if enduseoption == 2: #direct-use
+        if ccplantfixedvalid == 1:
+            Cplant = ccplantfixed*ones
+        else:
+            Cplant = 1.12*1.15*ccplantadjfactor*250E-6*rowmax(HeatExtracted)*1000.
+    else: #all other options have power plant
+        Cplantcorrelation = powerplantcost(pptype, TenteringPP, ElectricityProduced)
+        if ccplantfixedvalid == 1:
+            Cplant = ccplantfixed*ones
+        else:
+            Cplant = 1.12*1.15*ccplantadjfactor*Cplantcorrelation*1.02
+
+    #add direct-use plant cost of co-gen system to Cplant (only of no total ccplant was provided)
+    if ccplantfixedvalid == 0 and math.floor(enduseoption/10) in [3, 4, 5]:
+        Cplant = Cplant + 1.12*1.15*ccplantadjfactor*250E-6*rowmax(HeatProduced/enduseefficiencyfactor)*1000.
+
+    if totalcapcostvalid == 0:
+        if ccexplfixedvalid == 1:
+            Cexpl = ccexplfixed*ones
+        else:
+            Cexpl = 1.15*ccexpladjfactor*1.12*(1. + C1well*0.6)
+        Cpiping = 750/1000*pipinglength
+        Ccap = Cexpl + Cwell + Cstim + Cgath + Cplant + Cpiping
+    else:
+        Ccap = totalcapcost*ones
+
+    return locals()
+
+
+#simulation stage: O&M costs
+def oamcosts(oamtotalfixedvalid, enduseoption, ElectricityProduced, HeatExtracted, oamplantfixedvalid,
+             oamplantfixed, oamplantadjfactor, Cplant, oamwellfixedvalid, oamwellfixed, oamwelladjfactor,
+             Cwell, Cgath, oamwaterfixedvalid, oamwaterfixed, oamwateradjfactor, nprod, prodwellflowrate,
+             waterloss, utilfactor, oamtotalfixed, redrill, Cstim, plantlifetime):
+    ones = np.ones(np.shape(Cplant))
+    if oamtotalfixedvalid == 0:
+        #labor cost
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if enduseoption == 1: #electricity
+                maxElectricityProduced = rowmax(ElectricityProduced)
+                Claborcorrelation = np.where(maxElectricityProduced < 2.5, 236./1E3, (589.*np.log(maxElectricityProduced)-304.)/1E3)
+            else:
+                maxHeatExtracted = rowmax(HeatExtracted)
+                Claborcorrelation = np.where(maxHeatExtracted < 2.5*5., 236./1E3, (589.*np.log(maxHeatExtracted/5.)-304.)/1E3)
+        Claborcorrelation = Claborcorrelation*1.1
+
+        if oamplantfixedvalid == 1:
+            Coamplant = oamplantfixed*ones
+        else:
+            Coamplant = oamplantadjfactor*(1.5/100.*Cplant + 0.75*Claborcorrelation)
+
+        if oamwellfixedvalid == 1:
+            Coamwell = oamwellfixed*ones
+        else:
+            Coamwell = oamwelladjfactor*(1./100.*(Cwell + Cgath) + 0.25*Claborcorrelation)
+
+        if oamwaterfixedvalid == 1:
+            Coamwater = oamwaterfixed*ones
+        else:
+            Coamwater = oamwateradjfactor*(nprod*prodwellflowrate*waterloss*utilfactor*365.*24.*3600./1E6*925./1E6)*ones
+
+        Coam = Coamwell + Coamplant + Coamwater
+    else:
+        Coam = oamtotalfixed*ones
+
+    #account for well redrilling
+    Coam = np.where(redrill > 0, Coam + (Cwell + Cstim)*redrill/plantlifetime, Coam)
+
+    return locals()
+
+
+def annualenergy(power, plantlifetime, timestepsperyear, utilfactor):
+    """returns annual energy [kWh] of power time series [MW] (trapezoidal rule per year) with shape (n, plantlifetime)"""
+    if kernels.enabled():
+        return kernels.annualenergy(power, plantlifetime, timestepsperyear, utilfactor)
+    dx = 1./timestepsperyear*365.*24.
+    intervals = dx*(power[:, 1:] + power[:, :-1])/2.0
+    #accumulated in float64 also for single precision time series
+    return intervals.reshape(-1, plantlifetime, timestepsperyear).sum(axis=2, dtype=np.float64)*1000.*utilfactor
+
+
+#simulation stage: annual electricity/heat production and reservoir heat content
+def production(plantlifetime, HeatExtracted, timestepsperyear, utilfactor, PumpingPower, enduseoption,
+               ElectricityProduced, NetElectricityProduced, HeatProduced, resvol, rhorock, cprock, Trock,
+               Tinj):
+    HeatkWhExtracted = annualenergy(HeatExtracted, plantlifetime, timestepsperyear, utilfactor)
+    PumpingkWh = annualenergy(PumpingPower*np.ones(np.shape(HeatExtracted), dtype=HeatExtracted.dtype), plantlifetime, timestepsperyear, utilfactor)
+    if enduseoption == 1 or enduseoption > 2:
+        TotalkWhProduced = annualenergy(ElectricityProduced, plantlifetime, timestepsperyear, utilfactor)
+        NetkWhProduced = annualenergy(NetElectricityProduced, plantlifetime, timestepsperyear, utilfactor)
+    if enduseoption > 1:
+        HeatkWhProduced = annualenergy(HeatProduced, plantlifetime, timestepsperyear, utilfactor)
+
+    InitialReservoirHeatContent = resvol*rhorock*cprock*(Trock-Tinj)/1E15   #10^15 J
+    RemainingReservoirHeatContent = InitialReservoirHeatContent-np.cumsum(HeatkWhExtracted, axis=1)*3600*1E3/1E15
+
+    return locals()
+
+
+#simulation stage: levelized cost of electricity/heat
+def economics(econmodel, enduseoption, FCR, inflrateconstruction, Ccap, Coam, NetkWhProduced, PumpingkWh,
+              elecprice, HeatkWhProduced, heatprice, discountrate, plantlifetime, FIB, BIR, CTR, EIR, RINFL,
+              PTR, RITC, GTR):
+    rowsum = lambda x: np.sum(x, axis=1).reshape(-1, 1)
+    if econmodel == 1: #simple FCR model
+        if enduseoption == 1:
+            Price = (FCR*(1+inflrateconstruction)*Ccap + Coam)/rowaverage(NetkWhProduced)*1E8
+        elif enduseoption == 2:
+            averageannualpumpingcosts = rowaverage(PumpingkWh)*elecprice/1E6
+            Price = (FCR*(1+inflrateconstruction)*Ccap + Coam + averageannualpumpingcosts)/rowaverage(HeatkWhProduced)*1E8
+            Price = Price*2.931
+        elif enduseoption > 2:
+            if enduseoption % 10 == 1:
+                averageannualheatincome = rowaverage(HeatkWhProduced)*heatprice/1E6
+                Price = (FCR*(1+inflrateconstruction)*Ccap + Coam - averageannualheatincome)/rowaverage(NetkWhProduced)*1E8
+            elif enduseoption % 10 == 2:
+                averageannualelectricityincome = rowaverage(NetkWhProduced)*elecprice/1E6
+                Price = (FCR*(1+inflrateconstruction)*Ccap + Coam - averageannualelectricityincome)/rowaverage(HeatkWhProduced)*1E8
+                Price = Price*2.931
+    elif econmodel == 2: #standard levelized cost model
+        discountvector = 1./np.power(1+discountrate, np.linspace(0, plantlifetime-1, plantlifetime))
+        if enduseoption == 1:
+            Price = ((1+inflrateconstruction)*Ccap + rowsum(Coam*discountvector))/rowsum(NetkWhProduced*discountvector)*1E8
+        elif enduseoption == 2:
+            averageannualpumpingcosts = rowaverage(PumpingkWh)*elecprice/1E6
+            Price = ((1+inflrateconstruction)*Ccap + rowsum((Coam+PumpingkWh*elecprice/1E6)*discountvector))/rowsum(HeatkWhProduced*discountvector)*1E8
+            Price = Price*2.931
+        elif enduseoption > 2:
+            if enduseoption % 10 == 1:
+                annualheatincome = HeatkWhProduced*heatprice/1E6
+                Price = ((1+inflrateconstruction)*Ccap + rowsum((Coam-annualheatincome)*discountvector))/rowsum(NetkWhProduced*discountvector)*1E8
+            elif enduseoption % 10 == 2:
+                annualelectricityincome = NetkWhProduced*elecprice/1E6
+                Price = ((1+inflrateconstruction)*Ccap + rowsum((Coam-annualelectricityincome)*discountvector))/rowsum(HeatkWhProduced*discountvector)*1E8
+                Price = Price*2.931
+    elif econmodel == 3: #bicycle model
+        iave = FIB*BIR*(1-CTR) + (1-FIB)*EIR
+        CRF = iave/(1-np.power(1+iave, -plantlifetime))
+        inflationvector = np.power(1+RINFL, np.linspace(1, plantlifetime, plantlifetime))
+        discountvector = 1./np.power(1+iave, np.linspace(1, plantlifetime, plantlifetime))
+        NPVcap = rowsum((1+inflrateconstruction)*Ccap*CRF*discountvector)
+        NPVfc = rowsum((1+inflrateconstruction)*Ccap*PTR*inflationvector*discountvector)
+        NPVit = rowsum(CTR/(1-CTR)*((1+inflrateconstruction)*Ccap*CRF-Ccap/plantlifetime)*discountvector)
+        NPVitc = (1+inflrateconstruction)*Ccap*RITC/(1-CTR)
+        if enduseoption == 1:
+            NPVoandm = rowsum(Coam*inflationvector*discountvector)
+            NPVgrt = GTR/(1-GTR)*(NPVcap + NPVoandm + NPVfc + NPVit - NPVitc)
+            Price = (NPVcap + NPVoandm + NPVfc + NPVit + NPVgrt - NPVitc)/rowsum(NetkWhProduced*inflationvector*discountvector)*1E8
+        elif enduseoption == 2:
+            PumpingCosts = PumpingkWh*elecprice/1E6
+            averageannualpumpingcosts = rowaverage(PumpingkWh)*elecprice/1E6
+            NPVoandm = rowsum((Coam+PumpingCosts)*inflationvector*discountvector)
+            NPVgrt = GTR/(1-GTR)*(NPVcap + NPVoandm + NPVfc + NPVit - NPVitc)
+            Price = (NPVcap + NPVoandm + NPVfc + NPVit + NPVgrt - NPVitc)/rowsum(HeatkWhProduced*inflationvector*discountvector)*1E8
+            Price = Price*2.931
+        elif enduseoption > 2:
+            NPVoandm = rowsum(Coam*inflationvector*discountvector)
+            NPVgrt = GTR/(1-GTR)*(NPVcap + NPVoandm + NPVfc + NPVit - NPVitc)
+            if enduseoption % 10 == 1:
+                annualheatincome = HeatkWhProduced*heatprice/1E6
+                Price = (NPVcap + NPVoandm + NPVfc + NPVit + NPVgrt - NPVitc - rowsum(annualheatincome*inflationvector*discountvector))/rowsum(NetkWhProduced*inflationvector*discountvector)*1E8
+            elif enduseoption % 10 == 2:
+                annualelectricityincome = NetkWhProduced*elecprice/1E6
+                Price = (NPVcap + NPVoandm + NPVfc + NPVit + NPVgrt - NPVitc - rowsum(annualelectricityincome*inflationvector*discountvector))/rowsum(HeatkWhProduced*inflationvector*discountvector)*1E8
+                Price = Price*2.931
+
+    return locals()
+
+
+#simulation stages in order of execution (same stages and variables as GEOPHIRESv2.stages)
+stages = [geotherm, reservoir, wellbore, hydraulics, surfaceplant, capitalcosts, oamcosts, production, economics]
+
+#stages computing the time series (run in the precision of simulate's dtype, the other stages in float64)
+timeseriesstages = [geotherm, reservoir, wellbore, hydraulics, surfaceplant]
+
+
+def castarrays(variables, dtype, columnsonly=False):
+    """converts the floating point arrays of shape (n, m) in variables that are arguments of stages to dtype (only
+    those of shape (n, 1) if columnsonly), layer lists (gradient, layerthickness) included. Intermediate values of a
+    stage (e.g. the dimensionless times of reservoir model 2) are left in float64."""
+    arguments = set(name for stage in stages for name in inspect.signature(stage).parameters)
+    def cast(value):
+        if isinstance(value, np.ndarray) and value.ndim == 2 and value.dtype in [np.float32, np.float64] \
+                and (value.shape[1] == 1 or not columnsonly):
+            return value.astype(dtype, copy=False)
+        return value
+    for name, value in variables.items():
+        if name in arguments:
+            variables[name] = [cast(x) for x in value] if isinstance(value, list) else cast(value)
+
+
+def simulate(parameters, overrides=None, dtype=np.float64):
+    """runs all scenarios and returns GEOPHIRESv2.SimulationResult with one row per scenario
+
+    parameters: input parameters of the base case (as returned by GEOPHIRESv2.readinput)
+    overrides: dictionary parameter name -> per-scenario values (all of the same length n). gradient and
+    layerthickness take a list of (scalar or per-scenario) layer values, one per layer.
+    dtype: precision of the time series (np.float64 or np.float32)
+    Per-scenario results (e.g. Price, Trock) are returned with shape (n,), time series with shape (n, nt)."""
+    dtype = np.dtype(dtype)
+    if dtype not in [np.float32, np.float64]:
+        raise ValueError('time series precision must be float32 or float64')
+    overrides = overrides or {}
+    if parameters.get('prodwellflowrates') is not None:
+        raise ValueError('well fields with individual flow rates and diameters are not supported by the vectorized engine')
+    if parameters.get('heatdemandfname') is not None:
+        raise ValueError('hourly dispatch against a heat demand profile is not supported by the vectorized engine')
+    for name in overrides:
+        if name in discreteparameters:
+            raise ValueError("parameter '%s' selects a model option and cannot vary between scenarios" % name)
+    lengths = set(len(column(x)) for name, value in overrides.items()
+                  for x in (value if name in ['gradient', 'layerthickness'] else [value]) if np.ndim(x) > 0)
+    if len(lengths) > 1:
+        raise ValueError('per-scenario parameters must all have the same number of scenarios')
+    n = lengths.pop() if lengths else 1
+
+    variables = dict(parameters)
+    for name, value in overrides.items():
+        if name in ['gradient', 'layerthickness']:
+            variables[name] = [column(x) if np.ndim(x) > 0 else x for x in value]
+        else:
+            variables[name] = column(value) if np.ndim(value) > 0 else value
+    variables['depth'] = column(variables['depth'])
+    singleprecision = dtype == np.float32
+    if singleprecision:
+        castarrays(variables, dtype)
+
+    previous = GEOPHIRESv2.profiler
+    GEOPHIRESv2.profiler = profile = GEOPHIRESv2.Profiler()
+    try:
+        for stage in stages:
+            GEOPHIRESv2.runstage(stage, variables)
+            if singleprecision and stage in timeseriesstages:
+                #time series stay in single precision, per-scenario values go back to float64 for the cost models
+                castarrays(variables, dtype if stage is not timeseriesstages[-1] else np.float64,
+                           columnsonly=stage is timeseriesstages[-1])
+    finally:
+        GEOPHIRESv2.profiler = previous
+
+    #values calculated once for all scenarios (one row) are repeated for every scenario, per-scenario values are
+    #returned as one-dimensional arrays
+    for name, value in variables.items():
+        if isinstance(value, np.ndarray) and value.ndim == 2 and value.shape[0] in [1, n]:
+            value = np.broadcast_to(value, (n, value.shape[1])).copy()
+            variables[name] = value.ravel() if value.shape[1] == 1 else value
+    return GEOPHIRESv2.SimulationResult(variables, profile)
+
+
+def sampleoverrides(overrides, index):
+    """returns the overrides of the scenarios index"""
+    sample = lambda x: column(x)[index, 0] if np.ndim(x) > 0 else x
+    return dict((name, [sample(x) for x in value] if name in ['gradient', 'layerthickness'] else sample(value))
+                for name, value in (overrides or {}).items())
+
+
+def precisioncheck(parameters, overrides=None, samples=100, seed=0, dtype=np.float32):
+    """runs a random sample of the scenarios in float64 and in dtype and returns dictionary with number of compared
+    scenarios (those with a finite Price in float64), maximum relative deviation of Price (inf if Price is not
+    finite in dtype) and the scenario with the maximum deviation (-1 if none)"""
+    lengths = [len(column(x)) for name, value in (overrides or {}).items()
+               for x in (value if name in ['gradient', 'layerthickness'] else [value]) if np.ndim(x) > 0]
+    n = lengths[0] if lengths else 1
+    index = np.sort(np.random.default_rng(seed).choice(n, min(samples, n), replace=False))
+    sample = sampleoverrides(overrides, index)
+    with np.errstate(all='ignore'):
+        reference = np.broadcast_to(simulate(parameters, sample).Price, index.shape)
+        Price = np.broadcast_to(simulate(parameters, sample, dtype).Price, index.shape)
+        #scenarios without a finite Price in float64 are not compared, a non-finite Price in dtype only is an
+        #infinite deviation
+        compared = np.isfinite(reference)
+        deviation = np.where(np.isfinite(Price), np.abs(Price/reference-1), np.inf)[compared]
+    if len(deviation) == 0:
+        return {'samples': 0, 'maxdeviation': 0., 'scenario': -1}
+    worst = int(np.argmax(deviation))
+    return {'samples': len(deviation), 'maxdeviation': float(deviation[worst]), 'scenario': int(index[compared][worst])}
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Smoke tests of GEOPHIRES v2.0: run the example problems with the input paths
+added on top of GEOPHIRESv2.py (well fields, parameter mappings, sweeps,
+sessions, ...). Run from the GEOPHIRES folder:
+    python -m pytest tests
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if rootdir not in sys.path:
+    sys.path.insert(0, rootdir)
+
+
+@pytest.fixture(autouse=True)
+def geophiresfolder(monkeypatch):
+    """runs every test in the GEOPHIRES folder (file names in input files are relative to it)"""
+    monkeypatch.chdir(rootdir)
+
+
+@pytest.fixture
+def deck():
+    """returns function returning the content (list of lines) of an example input file with lines prepended
+    (GEOPHIRES reads a parameter from the first line containing it)"""
+    def exampledeck(example, *lines):
+        with open(os.path.join(rootdir, 'Examples', example), encoding='UTF-8') as f:
+            return [line+'\n' for line in lines] + f.readlines()
+    return exampledeck
+
+
+@pytest.fixture
+def simulate(tmp_path):
+    """returns function running GEOPHIRESv2.runGEOPHIRES on input file content or a parameter mapping (console output
+    suppressed), the case report is written to the test's temporary folder"""
+    import GEOPHIRESv2
+    def run(content, outputfname='HDR.out'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return GEOPHIRESv2.runGEOPHIRES(None, str(tmp_path / outputfname), content=content)
+    return run
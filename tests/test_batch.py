@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""batch runs (geophires.batch): sharded runs and deduplication"""
+
+import os
+import shutil
+
+from geophires import batch
+
+
+def test_relocatedshards(tmp_path):
+    """shard results merge when the shared folder is mounted at another path"""
+    run = tmp_path / 'node1' / 'run'
+    os.makedirs(run)
+    for example in ['example2.txt', 'example3.txt']:
+        shutil.copyfile(os.path.join('Examples', example), str(run / example))
+    manifest = str(run / 'manifest.json')
+    assert batch.main([str(run / 'example2.txt'), str(run / 'example3.txt'), '--manifest', manifest, '--shards', '2']) == 0
+    for shard in ['1/2', '2/2']:
+        assert batch.main(['--manifest', manifest, '--shard', shard]) == 0
+    shutil.copytree(str(tmp_path / 'node1'), str(tmp_path / 'node2'))
+    output = str(tmp_path / 'results.csv')
+    assert batch.main(['--manifest', str(tmp_path / 'node2' / 'run' / 'manifest.json'), '--merge', '--output', output]) == 0
+    rows, missing = batch.mergeshards(str(tmp_path / 'node2' / 'run' / 'manifest.json'))
+    assert [row['case'] for row in rows] == ['example2', 'example3'] and not missing
+
+
+def test_dedup(deck):
+    """a case with the canonical input of a finished case gets its row"""
+    cases = [('base', deck('example2.txt')), ('comment', deck('example2.txt', '#another comment line'))]
+    rows = batch.runbatch(cases, dedup=True)
+    assert rows[1]['duplicateof'] == 'base' and rows[1]['price'] == rows[0]['price']
+
+
+def test_dedupeditedfile(deck, tmp_path):
+    """cases reading edited versions of a file are not duplicates"""
+    with open('Examples/HeatDemand.txt', encoding='UTF-8') as f:
+        lines = f.readlines()
+    fname = tmp_path / 'HeatDemand.txt'
+    content = deck('example2.txt', 'Hourly Heat Demand File Name,%s,' % fname)
+    fname.write_text(''.join(lines), encoding='UTF-8')
+    first = batch.caseinputhash('first', content)
+    fname.write_text(''.join(line.replace(',', ',1') for line in lines), encoding='UTF-8')
+    assert batch.caseinputhash('second', content) not in [first, None]
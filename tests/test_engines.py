@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""accelerated engines on the example problems: vectorized engine, resource mapping and CHP fraction sweeps"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+import GEOPHIRESv2
+from geophires import chp, mapping, vectorized
+
+
+def readparameters(content):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GEOPHIRESv2.readinput(content)
+
+
+@pytest.mark.parametrize('example', ['example1.txt', 'example2.txt', 'example3.txt', 'example4.txt', 'example5.txt'])
+def test_vectorized(deck, simulate, example):
+    """the vectorized engine gives the Price of GEOPHIRESv2.py (within the tolerance of geophires.equivalence)"""
+    reference = simulate(deck(example))
+    result = vectorized.simulate(readparameters(deck(example)))
+    np.testing.assert_allclose(result.Price, [reference.Price], rtol=1E-6)
+
+
+def test_mapping(deck, simulate, tmp_path):
+    """every mapped cell has the Price of the base case with the cell's gradient"""
+    gradients = np.array([[40., 50., 60.], [70., np.nan, 80.]])
+    summary = mapping.runmap('Examples/example2.txt', {'Gradient 1': gradients}, str(tmp_path), tilesize=2)
+    assert summary['calculated'] == 5
+    Price = np.load(str(tmp_path / 'Price.npy'))
+    assert np.isnan(Price[1, 1])
+    reference = simulate(deck('example2.txt', 'Gradient 1,60,'))
+    assert Price[0, 2] == pytest.approx(reference.Price, rel=1E-6)
+    with pytest.raises(ValueError):
+        mapping.runmap('Examples/example2.txt', {'Gradient 3': gradients}, str(tmp_path))
+
+
+def test_chpsweep(deck):
+    """the fraction sweep of a parallel cogeneration case agrees with GEOPHIRESv2.py"""
+    parameters = readparameters(deck('example1.txt', 'End-Use Option,51,'))
+    fractions = np.linspace(0.1, 0.9, 9)
+    result = chp.fractionsweep(parameters, fractions)
+    assert chp.verify(parameters, fractions[[0, 4, 8]], result.Price[[0, 4, 8]]) < 1E-6
+    breakeven = chp.breakeven(fractions, result)
+    assert breakeven is None or 0.1 <= breakeven <= 0.9
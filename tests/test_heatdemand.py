@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""hourly heat dispatch against a streamed heat demand profile (example2, direct-use heat)"""
+
+import numpy as np
+import pytest
+
+import GEOPHIRESv2
+
+
+def test_dispatch(deck, simulate):
+    result = simulate(deck('example2.txt', 'Hourly Heat Demand File Name,Examples/HeatDemand.txt,',
+                           'Hourly Dispatch Chunk Size,1000,'))
+    assert result.status == 'ok' and np.isfinite(result.Price)
+    assert np.all(result.HeatkWhProduced <= result.HeatkWhDemand)
+
+
+def test_invalidprofile(deck, simulate, tmp_path):
+    """an invalid profile raises InputFileError (instead of exiting the process), the bytes read are counted"""
+    with open('Examples/HeatDemand.txt', encoding='UTF-8') as f:
+        lines = f.readlines()
+    fname = tmp_path / 'HeatDemand.txt'
+    fname.write_text(''.join(lines[:5000]) + '5000,abc\n', encoding='UTF-8')
+    with pytest.raises(GEOPHIRESv2.InputFileError):
+        simulate(deck('example2.txt', 'Hourly Heat Demand File Name,%s,' % fname, 'Hourly Dispatch Chunk Size,1000,'))
+    assert GEOPHIRESv2.profiler.counters['bytesread'] >= len(''.join(lines[:5000]))
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""JSON/TOML input files and parameter mappings (typed values, validated against GEOPHIRESv2.inputparametertypes)"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import GEOPHIRESv2
+from geophires import server
+
+
+@pytest.fixture(scope='module')
+def example1():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Examples', 'example1.json'),
+              encoding='UTF-8') as f:
+        return json.load(f)
+
+
+def test_jsonfile(simulate):
+    """example1.json gives the results of example1.txt"""
+    text = simulate(GEOPHIRESv2.readinputfile('Examples/example1.txt'))
+    mapping = simulate(GEOPHIRESv2.readinputfile('Examples/example1.json'))
+    assert mapping.Price == text.Price
+
+
+def test_tomlfile(simulate, tmp_path, example1):
+    """TOML tables only group the parameters"""
+    names = list(example1)
+    lines = ['[reservoir]'] + ['"%s" = %s' % (name, json.dumps(example1[name])) for name in names[:10]]
+    lines += ['[plant]'] + ['"%s" = %s' % (name, json.dumps(example1[name])) for name in names[10:]]
+    fname = tmp_path / 'example1.toml'
+    fname.write_text('\n'.join(lines)+'\n', encoding='UTF-8')
+    assert simulate(GEOPHIRESv2.readinputfile(str(fname))).Price == simulate(example1).Price
+
+
+@pytest.mark.parametrize('parameters, error', [({'Bogus': 1}, KeyError), ({'Reservoir Depth': 'deep'}, ValueError),
+                                               ({'Plant Lifetime': 25.5}, ValueError),
+                                               ({'Production Well Flow Rates': [50, 'x']}, ValueError),
+                                               ({'economics': {'Plant Lifetime': 30}, 'Plant Lifetime': 25}, ValueError)])
+def test_invalidmapping(example1, parameters, error):
+    with pytest.raises(error):
+        GEOPHIRESv2.readinput(dict(example1, **parameters))
+
+
+def test_overrides(simulate, deck, example1):
+    """typed overrides of text input give the results of the same values in a mapping"""
+    overridden = simulate(GEOPHIRESv2.InputValues(deck('example1.txt'), {'Plant Lifetime': 25., 'Reservoir Depth': 4}))
+    mapping = simulate(dict(example1, **{'Plant Lifetime': 25, 'Reservoir Depth': 4}))
+    assert overridden.plantlifetime == 25
+    assert overridden.Price == mapping.Price
+
+
+def test_serverrequest(example1):
+    """server requests apply their parameters to the input file as typed values"""
+    request = {'inputfile': 'Examples/example2.txt', 'parameters': {'Plant Lifetime': 25.0}}
+    response = server.simulate(server.inputcontent(request), outputs=['Price', 'plantlifetime'])
+    assert response['status'] == 'ok' and response['results']['plantlifetime'] == 25
+    with pytest.raises(ValueError):
+        server.inputcontent({'parameters': {'Bogus': 1}})
+
+
+def test_commandlineerror(tmp_path, example1):
+    """an invalid mapping stops the command line run with an error and non-zero exit status"""
+    fname = tmp_path / 'bad.json'
+    fname.write_text(json.dumps(dict(example1, Bogus=1)), encoding='UTF-8')
+    run = subprocess.run([sys.executable, 'GEOPHIRESv2.py', str(fname), str(tmp_path / 'HDR.out')], capture_output=True,
+                         text=True)
+    assert run.returncode != 0
+    assert "unknown input parameter 'Bogus'" in run.stdout
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""simulation server requests (geophires.server), run in the test process"""
+
+import pytest
+
+from geophires import server
+
+
+@pytest.mark.parametrize('inputfile', ['/etc/passwd', '../README.md', 'Examples/../../README.md'])
+def test_inputfileoutsidefolder(inputfile):
+    with pytest.raises(ValueError):
+        server.inputcontent({'inputfile': inputfile})
+
+
+def test_timeout():
+    """a simulation running longer than the timeout is interrupted (reservoir model 1 takes about a second)"""
+    response = server.simulate(server.inputcontent({'inputfile': 'Examples/example1.txt'}), timeout=0.2)
+    assert response['status'] == 'timeout'
+    response = server.simulate(server.inputcontent({'inputfile': 'Examples/example2.txt'}), timeout=60)
+    assert response['status'] == 'ok'
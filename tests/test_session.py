@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""incremental what-if sessions (geophires.session)"""
+
+import contextlib
+import io
+
+import pytest
+
+import GEOPHIRESv2
+from geophires.session import Session
+
+
+def parameters(content):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return GEOPHIRESv2.readinput(content)
+
+
+def test_update(deck):
+    """an update reruns only the dependent stages and gives the results of a new session"""
+    session = Session(parameters=parameters(deck('example2.txt')))
+    session['Price']
+    session.update(ccplantadjfactor=1.2)
+    assert session.recalculated == ['capitalcosts', 'oamcosts', 'economics']
+    fresh = Session(parameters=dict(parameters(deck('example2.txt')), ccplantadjfactor=1.2))
+    assert session['Price'] == pytest.approx(fresh['Price'], rel=1E-12)
+
+
+def test_lazyreservoirupdate(deck):
+    """with lazy reservoir evaluation a maximum drawdown update reuses the calculated reservoir blocks"""
+    content = deck('example2.txt', 'Lazy Reservoir Evaluation,1,')
+    session = Session(parameters=parameters(content))
+    session['Price']
+    blocks = session['reservoirblocks']
+    calculated = len(blocks.output)
+    session.update(maxdrawdown=0.02)
+    assert 'reservoir' not in session.recalculated
+    assert session['reservoirblocks'] is blocks and len(blocks.output) == calculated
+    fresh = Session(parameters=dict(parameters(content), maxdrawdown=0.02))
+    assert session['Price'] == pytest.approx(fresh['Price'], rel=1E-12)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""parameter sweeps (geophires.sweep) on text and JSON base cases"""
+
+import json
+import os
+
+import pytest
+
+from geophires import batch, sweep
+
+
+def writespec(tmp_path, axes, base='Examples/example2.txt'):
+    fname = tmp_path / 'sweep.json'
+    fname.write_text(json.dumps({'base': os.path.abspath(base), 'axes': axes}), encoding='UTF-8')
+    return sweep.Sweep.read(str(fname))
+
+
+@pytest.mark.parametrize('base', ['Examples/example2.txt', 'Examples/example1.json'])
+def test_integeraxis(tmp_path, base):
+    """integral values of integer parameters reach readinput as integers"""
+    spec = writespec(tmp_path, [{'product': {'Plant Lifetime': {'linspace': [20, 30, 3]}}}], base)
+    cases = list(spec)
+    assert [assignment['Plant Lifetime'] for case, assignment, content in cases] == [20, 25, 30]
+    rows = batch.runbatch([(case, content) for case, assignment, content in cases])
+    assert [row['status'] for row in rows] == ['ok']*3
+    assert len(set(row['price'] for row in rows)) == 3
+
+
+def test_nonintegralvalue(tmp_path):
+    with pytest.raises(ValueError):
+        writespec(tmp_path, [{'product': {'Plant Lifetime': [20, 25.5]}}])
+    with pytest.raises(ValueError):
+        writespec(tmp_path, [{'random': {'Plant Lifetime': {'uniform': [20, 30]}}, 'samples': 2}])
+
+
+def test_resumechangedspec(tmp_path):
+    """a checkpoint resumes scenarios by their input, not by their position"""
+    checkpoint = str(tmp_path / 'run.ckpt')
+    first = writespec(tmp_path, [{'product': {'Reservoir Depth': [2, 3]}}])
+    rows = batch.runbatch([(case, content) for case, assignment, content in first], checkpoint=checkpoint)
+    second = writespec(tmp_path, [{'product': {'Reservoir Depth': [3, 4]}}])
+    resumed = batch.runbatch([(case, content) for case, assignment, content in second], checkpoint=checkpoint)
+    assert resumed[0] == dict(rows[1], case='case1')
+    assert resumed[1]['price'] not in [row['price'] for row in rows]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""well fields with per-well flow rates and diameters (impedance model: example2, productivity and injectivity
+index: example1)"""
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('example', ['example1.txt', 'example2.txt'])
+def test_identicalwells(deck, simulate, example):
+    """a field of identical wells gives the results of the identical wells model"""
+    base = simulate(deck(example))
+    rate = '%g' % base.prodwellflowrate
+    field = simulate(deck(example, 'Production Well Flow Rates,%s;%s,' % (rate, rate)))
+    np.testing.assert_allclose(field.Price, base.Price, rtol=1E-12)
+    np.testing.assert_allclose(field.PumpingPower, base.PumpingPower, rtol=1E-12)
+    if base.impedancemodelused == 1:
+        np.testing.assert_allclose(field.DP, base.DP, rtol=1E-12)
+
+
+@pytest.mark.parametrize('example', ['example1.txt', 'example2.txt'])
+def test_unequalwells(deck, simulate, tmp_path, example):
+    """a field of unequal wells runs through the case report"""
+    result = simulate(deck(example, 'Production Well Flow Rates,25;35,', 'Production Well Diameters,7;8,'))
+    assert result.status == 'ok'
+    assert np.isfinite(result.Price)
+    if result.impedancemodelused == 1:
+        assert np.all(np.isfinite(result.DP))
+    with open(tmp_path / 'HDR.out', encoding='UTF-8') as f:
+        assert 'Flowrate of every production well (kg/s)' in f.read()